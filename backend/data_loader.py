@@ -8,26 +8,50 @@ This module handles:
 """
 
 import pandas as pd
-from typing import Dict, Any, List
-import io
+from typing import Dict, Any, List, BinaryIO, Optional
+import hashlib
+import tempfile
 from utils import logger, validate_file_extension
 
 
+# Rows parsed at upload time for the preview and column detection
+PREVIEW_ROWS = 10
+
+# Block size used when copying the upload
+COPY_BLOCK_SIZE = 1024 * 1024
+
+# Rows per chunk when parsing the full dataset
+CHUNK_SIZE = 500_000
+
+# Uploads smaller than this stay in memory; larger ones spill to disk
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+
 class DataLoader:
     """Handles dataset loading and validation."""
     
     def __init__(self):
         """Initialize the data loader."""
-        self.dataframe: pd.DataFrame = None
+        self.dataframe: pd.DataFrame = None  # Preview rows only; see materialize()
         self.filename: str = None
         self.file_size: int = 0
+        self.row_count: int = 0
+        self.content_hash: str = None
+        self._source: Optional[BinaryIO] = None
     
-    def load_csv_from_bytes(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
+    def load_csv_from_stream(self, file_obj: BinaryIO, filename: str) -> Dict[str, Any]:
         """
-        Load CSV from uploaded bytes.
+        Load CSV from an uploaded file object.
+        
+        The upload is kept in a private spooled copy and only the first
+        ``PREVIEW_ROWS`` rows are parsed; the full dataset is parsed later by
+        ``materialize`` once the needed columns are known. The row count is
+        taken from the number of line breaks seen while copying, so quoted
+        multi-line fields and blank lines make it an estimate. Callers holding
+        raw bytes can wrap them in ``io.BytesIO``.
         
         Args:
-            file_bytes: CSV file content as bytes
+            file_obj: Binary file-like object positioned anywhere in the CSV
             filename: Name of the uploaded file
             
         Returns:
@@ -43,10 +67,31 @@ class DataLoader:
             raise ValueError("Only CSV files are supported. Please upload a .csv file.")
         
         try:
-            # Read CSV
-            self.dataframe = pd.read_csv(io.BytesIO(file_bytes))
+            # Keep our own copy (the upload stream is closed after the
+            # request), counting line breaks and hashing on the way
+            file_obj.seek(0)
+            self._source = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+            digest = hashlib.blake2b(digest_size=16)
+            newlines = 0
+            last_byte = b''
+            while True:
+                block = file_obj.read(COPY_BLOCK_SIZE)
+                if not block:
+                    break
+                self._source.write(block)
+                digest.update(block)
+                newlines += block.count(b'\n')
+                last_byte = block[-1:]
+            self.file_size = self._source.tell()
+            self.content_hash = digest.hexdigest()
             self.filename = filename
-            self.file_size = len(file_bytes)
+            
+            # Header line excluded; count a final line without a line break
+            self.row_count = max(0, newlines - 1 + (last_byte not in (b'', b'\n')))
+            
+            # Parse only the preview rows
+            self._source.seek(0)
+            self.dataframe = pd.read_csv(self._source, engine='c', nrows=PREVIEW_ROWS)
             
             # Validate dataframe
             if self.dataframe.empty:
@@ -55,7 +100,7 @@ class DataLoader:
             if len(self.dataframe.columns) < 2:
                 raise ValueError("CSV must have at least 2 columns (ID and Item).")
             
-            logger.info(f"Successfully loaded {len(self.dataframe)} rows and {len(self.dataframe.columns)} columns")
+            logger.info(f"Successfully loaded {self.row_count} rows and {len(self.dataframe.columns)} columns")
             
             return self.get_preview()
             
@@ -69,7 +114,45 @@ class DataLoader:
             logger.error(f"Unexpected error loading CSV: {str(e)}")
             raise ValueError(f"Error loading file: {str(e)}")
     
-    def get_preview(self, num_rows: int = 10) -> Dict[str, Any]:
+    def load_csv_chunked(self, file_obj: BinaryIO, usecols: Optional[List[str]] = None,
+                         chunksize: int = CHUNK_SIZE,
+                         categorical: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Parse a CSV in chunks, keeping only the requested columns.
+        
+        Args:
+            file_obj: Binary file-like object containing the CSV
+            usecols: Columns to keep (None for all)
+            chunksize: Number of rows parsed per chunk
+            categorical: Columns converted to ``category`` as each chunk is
+                parsed, so repeated values are stored once
+            
+        Returns:
+            DataFrame with the selected columns
+        """
+        categorical = categorical or []
+        file_obj.seek(0)
+        reader = pd.read_csv(file_obj, engine='c', usecols=usecols, chunksize=chunksize)
+        chunks = []
+        for chunk in reader:
+            for col in categorical:
+                chunk[col] = chunk[col].astype('category')
+            chunks.append(chunk)
+        if len(chunks) == 1:
+            return chunks[0]
+        
+        # concat only keeps the categorical dtype when all chunks share the
+        # same categories; the union also upcasts them to a common dtype when
+        # chunks were inferred differently (e.g. int and float)
+        for col in categorical:
+            categories = chunks[0][col].cat.categories
+            for chunk in chunks[1:]:
+                categories = categories.union(chunk[col].cat.categories)
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+        return pd.concat(chunks, ignore_index=True)
+    
+    def get_preview(self, num_rows: int = PREVIEW_ROWS) -> Dict[str, Any]:
         """
         Get dataset preview information.
         
@@ -94,23 +177,28 @@ class DataLoader:
         
         return {
             "filename": self.filename,
-            "rows": len(self.dataframe),
+            "rows": self.row_count,
             "columns": list(self.dataframe.columns),
             "preview_data": preview_data,
             "file_size": size_str,
             "column_types": {col: str(dtype) for col, dtype in self.dataframe.dtypes.items()}
         }
     
-    def get_dataframe(self) -> pd.DataFrame:
+    def materialize(self, usecols: Optional[List[str]] = None,
+                    categorical: Optional[List[str]] = None) -> pd.DataFrame:
         """
-        Get the loaded dataframe.
+        Parse the full uploaded dataset.
         
+        Args:
+            usecols: Columns to load (None for all)
+            categorical: Columns to load with the ``category`` dtype
+            
         Returns:
             Loaded pandas DataFrame
         """
-        if self.dataframe is None:
+        if self._source is None:
             raise ValueError("No dataset loaded.")
-        return self.dataframe
+        return self.load_csv_chunked(self._source, usecols, categorical=categorical)
     
     def get_column_names(self) -> List[str]:
         """
@@ -9,27 +9,59 @@ It provides endpoints for:
 - Results retrieval
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
+import multiprocessing
+import os
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from data_loader import DataLoader
 from preprocessing import DataPreprocessor
-from mining import PrefixSpan
+from mining import run_mining, decode_pattern
 from visualization_data import VisualizationDataGenerator
+from sessions import SessionStore, SessionState, MiningRun
 from schemas import (
     PreprocessingRequest, MiningResult, DatasetPreview, 
-    ErrorResponse, ColumnSelectionRequest, MiningParameters
+    ErrorResponse, ColumnSelectionRequest, MiningParameters,
+    BatchRequest, BatchResult, TablePageParams
 )
 from utils import logger, ensure_directory_exists
 
+# Mining worker processes, and the threads each one mines with. A worker
+# already mines on several threads, so two workers are enough to serve
+# concurrent /mine requests; together they use about one thread per CPU
+MINING_WORKERS = min(2, os.cpu_count() or 1)
+MINING_THREADS = max(1, (os.cpu_count() or 1) // MINING_WORKERS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the mining worker pool at startup and shut it down on exit."""
+    # Mining is CPU-bound; running it in worker processes keeps the event
+    # loop free to serve other requests meanwhile. Workers are spawned, not
+    # forked, so they do not inherit Numba's threads from this process
+    app.state.mining_pool = ProcessPoolExecutor(
+        max_workers=MINING_WORKERS,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+    yield
+    app.state.mining_pool.shutdown()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Sequential Pattern Mining API",
     description="Backend API for sequential pattern mining with visualization support",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware to allow frontend access
@@ -41,12 +73,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global state (In production, use proper state management or database)
-data_loader = None
-preprocessor = None
-current_sequences = None
-current_patterns = None
-viz_generator = None
+# Compress larger responses (tables, chart data) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Per-upload state, keyed by the hash of the uploaded file
+sessions = SessionStore()
 
 # Ensure output directories exist
 ensure_directory_exists("outputs")
@@ -63,6 +94,44 @@ async def root():
     }
 
 
+def get_session(session_id: str) -> SessionState:
+    """
+    Look up the session of an uploaded dataset.
+    
+    Args:
+        session_id: Session identifier returned by /upload
+        
+    Returns:
+        Session state
+        
+    Raises:
+        HTTPException: If the session is unknown or was evicted
+    """
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found. Please upload the dataset again.")
+    return session
+
+
+def get_mining_run(session_id: str) -> MiningRun:
+    """
+    Get the latest mining results of a session.
+    
+    Args:
+        session_id: Session identifier returned by /upload
+        
+    Returns:
+        Current mining run
+        
+    Raises:
+        HTTPException: If the session is unknown or nothing was mined yet
+    """
+    session = get_session(session_id)
+    if session.mining_run is None:
+        raise HTTPException(status_code=400, detail="No mining results available.")
+    return session.mining_run
+
+
 @app.post("/upload", response_model=DatasetPreview)
 async def upload_dataset(file: UploadFile = File(...)):
     """
@@ -74,19 +143,20 @@ async def upload_dataset(file: UploadFile = File(...)):
     Returns:
         Dataset preview information
     """
-    global data_loader
-    
     logger.info(f"Received file upload: {file.filename}")
     
     try:
-        # Read file contents
-        contents = await file.read()
-        
         # Initialize data loader
         data_loader = DataLoader()
         
-        # Load and validate CSV
-        preview = data_loader.load_csv_from_bytes(contents, file.filename)
+        # Load and validate CSV straight from the spooled upload
+        preview = data_loader.load_csv_from_stream(file.file, file.filename)
+        
+        # Re-uploading the same file resumes its session and cached results
+        session_id = data_loader.content_hash
+        if sessions.get(session_id) is None:
+            sessions.put(session_id, SessionState(data_loader))
+        preview["session_id"] = session_id
         
         logger.info("File uploaded and validated successfully")
         return preview
@@ -99,21 +169,41 @@ async def upload_dataset(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
 
+@app.get("/preview", response_model=DatasetPreview)
+async def get_dataset_preview(session_id: str = Query(...)):
+    """
+    Get the preview of an already uploaded dataset.
+    
+    Session identifiers are content hashes, so a client can hash a file
+    itself and use this to skip uploading a dataset the backend still has.
+    
+    Args:
+        session_id: Session identifier (BLAKE2b-128 hex digest of the file)
+        
+    Returns:
+        Dataset preview information, as returned by /upload
+    """
+    session = get_session(session_id)
+    preview = session.data_loader.get_preview()
+    preview["session_id"] = session_id
+    return preview
+
+
 @app.get("/columns")
-async def get_columns():
+async def get_columns(session_id: str = Query(...)):
     """
     Get list of available columns from uploaded dataset.
     
+    Args:
+        session_id: Session identifier returned by /upload
+        
     Returns:
         List of column names
     """
-    global data_loader
-    
-    if data_loader is None:
-        raise HTTPException(status_code=400, detail="No dataset uploaded. Please upload a CSV file first.")
+    session = get_session(session_id)
     
     try:
-        columns = data_loader.get_column_names()
+        columns = session.data_loader.get_column_names()
         return {"columns": columns}
     except Exception as e:
         logger.error(f"Error getting columns: {str(e)}")
@@ -121,20 +211,19 @@ async def get_columns():
 
 
 @app.post("/preprocess")
-async def preprocess_data(columns: ColumnSelectionRequest):
+async def preprocess_data(columns: ColumnSelectionRequest, session_id: str = Query(...)):
     """
     Preprocess data and generate sequences.
     
     Args:
         columns: Selected column names for sequence generation
+        session_id: Session identifier returned by /upload
         
     Returns:
         Preprocessing results and statistics
     """
-    global data_loader, preprocessor, current_sequences
-    
-    if data_loader is None:
-        raise HTTPException(status_code=400, detail="No dataset uploaded.")
+    session = get_session(session_id)
+    data_loader = session.data_loader
     
     try:
         logger.info("Starting data preprocessing")
@@ -149,8 +238,15 @@ async def preprocess_data(columns: ColumnSelectionRequest):
         if not all(validation.values()):
             raise ValueError(f"Invalid columns selected: {validation}")
         
-        # Get dataframe and create preprocessor
-        df = data_loader.get_dataframe()
+        # Parse only the selected columns and create preprocessor
+        usecols = [columns.sequence_id_column, columns.item_column]
+        if columns.timestamp_column:
+            usecols.append(columns.timestamp_column)
+        # ID and item values repeat across rows, so load them as categories
+        df = data_loader.materialize(
+            usecols=usecols,
+            categorical=[columns.sequence_id_column, columns.item_column]
+        )
         preprocessor = DataPreprocessor(df)
         
         # Generate sequences
@@ -160,8 +256,8 @@ async def preprocess_data(columns: ColumnSelectionRequest):
             columns.timestamp_column
         )
         
-        # Store sequences for mining
-        current_sequences = preprocessor.get_sequences()
+        # Store sequences for mining (drops results mined from older ones)
+        session.set_sequences(preprocessor)
         
         logger.info("Preprocessing completed successfully")
         return result
@@ -175,17 +271,22 @@ async def preprocess_data(columns: ColumnSelectionRequest):
 
 
 @app.post("/mine", response_model=MiningResult)
-async def mine_patterns(params: MiningParameters):
+async def mine_patterns(params: MiningParameters, session_id: str = Query(...)):
     """
     Perform sequential pattern mining.
     
+    Results are memoized per session and parameter set, so repeating a run
+    returns the stored result without mining again.
+    
     Args:
         params: Mining parameters (min_support, max_length)
+        session_id: Session identifier returned by /upload
         
     Returns:
         Mining results with frequent patterns
     """
-    global current_sequences, current_patterns, viz_generator
+    session = get_session(session_id)
+    current_sequences = session.sequences
     
     if current_sequences is None:
         raise HTTPException(
@@ -193,51 +294,67 @@ async def mine_patterns(params: MiningParameters):
             detail="No sequences available. Please upload and preprocess data first."
         )
     
+    run_key = (params.min_support, params.max_sequence_length)
+    run = session.get_mining_run(run_key)
+    if run is not None:
+        logger.info(f"Reusing mining results for min_support={params.min_support}")
+        return run.result
+    
     try:
         logger.info(f"Starting pattern mining with min_support={params.min_support}")
         
         start_time = time.time()
         
-        # Initialize PrefixSpan
-        miner = PrefixSpan(
-            sequences=current_sequences,
-            min_support=params.min_support,
-            max_pattern_length=params.max_sequence_length
+        # Mine patterns in the worker pool
+        loop = asyncio.get_running_loop()
+        patterns, total_patterns, length_stats, vocabulary = await loop.run_in_executor(
+            app.state.mining_pool, run_mining,
+            current_sequences, params.min_support, params.max_sequence_length, MINING_THREADS
         )
         
-        # Mine patterns
-        patterns = miner.mine_patterns()
-        current_patterns = patterns
-        
         execution_time = time.time() - start_time
         
+        # A /preprocess for this session may have replaced the sequences
+        # while mining ran; these patterns must not become its current run
+        if session.sequences is not current_sequences:
+            raise HTTPException(
+                status_code=409,
+                detail="The data was preprocessed again while mining. Please start mining again."
+            )
+        
         # Initialize visualization generator
-        viz_generator = VisualizationDataGenerator(patterns, current_sequences)
+        viz_generator = VisualizationDataGenerator(
+            patterns, current_sequences, total_patterns=total_patterns,
+            vocabulary=vocabulary, length_stats=length_stats
+        )
         
         # Prepare response
         result = MiningResult(
-            patterns=patterns[:100],  # Return top 100 for API response
-            total_patterns=len(patterns),
+            # Return top 100 for API response, decoded only for the response
+            patterns=[decode_pattern(p, vocabulary) for p in patterns[:100]],
+            total_patterns=total_patterns,
             total_sequences=len(current_sequences),
             min_support_used=params.min_support,
             execution_time=round(execution_time, 2)
         )
+        session.add_mining_run(run_key, MiningRun(
+            result, viz_generator, params.min_support, execution_time
+        ))
         
-        logger.info(f"Mining completed: {len(patterns)} patterns found")
+        logger.info(f"Mining completed: {total_patterns} patterns found")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Mining error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/visualizations/bar")
-async def get_bar_chart_data(top_n: int = 20):
+async def get_bar_chart_data(top_n: int = 20, session_id: str = Query(...)):
     """Get data for bar chart visualization."""
-    global viz_generator
-    
-    if viz_generator is None:
-        raise HTTPException(status_code=400, detail="No mining results available.")
+    viz_generator = get_mining_run(session_id).viz_generator
     
     try:
         data = viz_generator.prepare_bar_chart_data(top_n)
@@ -248,12 +365,9 @@ async def get_bar_chart_data(top_n: int = 20):
 
 
 @app.get("/visualizations/line")
-async def get_line_chart_data():
+async def get_line_chart_data(session_id: str = Query(...)):
     """Get data for line chart visualization."""
-    global viz_generator
-    
-    if viz_generator is None:
-        raise HTTPException(status_code=400, detail="No mining results available.")
+    viz_generator = get_mining_run(session_id).viz_generator
     
     try:
         data = viz_generator.prepare_line_chart_data()
@@ -264,12 +378,9 @@ async def get_line_chart_data():
 
 
 @app.get("/visualizations/heatmap")
-async def get_heatmap_data():
+async def get_heatmap_data(session_id: str = Query(...)):
     """Get data for heatmap visualization."""
-    global viz_generator
-    
-    if viz_generator is None:
-        raise HTTPException(status_code=400, detail="No mining results available.")
+    viz_generator = get_mining_run(session_id).viz_generator
     
     try:
         data = viz_generator.prepare_heatmap_data()
@@ -280,12 +391,9 @@ async def get_heatmap_data():
 
 
 @app.get("/visualizations/network")
-async def get_network_data(top_n: int = 15):
+async def get_network_data(top_n: int = 15, session_id: str = Query(...)):
     """Get data for network graph visualization."""
-    global viz_generator
-    
-    if viz_generator is None:
-        raise HTTPException(status_code=400, detail="No mining results available.")
+    viz_generator = get_mining_run(session_id).viz_generator
     
     try:
         data = viz_generator.prepare_network_data(top_n)
@@ -296,36 +404,45 @@ async def get_network_data(top_n: int = 15):
 
 
 @app.get("/results/table")
-async def get_table_data():
-    """Get all patterns in table format."""
-    global viz_generator
+async def get_table_data(session_id: str = Query(...), offset: int = Query(0, ge=0),
+                         limit: Optional[int] = Query(None, ge=1), min_support: int = Query(0, ge=0),
+                         lengths: Optional[List[int]] = Query(None)):
+    """
+    Get mined patterns in table format, optionally filtered and paginated.
     
-    if viz_generator is None:
-        raise HTTPException(status_code=400, detail="No mining results available.")
+    Without filters or a limit all patterns are returned.
+    
+    Args:
+        session_id: Session identifier returned by /upload
+        offset: Number of matching patterns to skip
+        limit: Maximum number of rows to return
+        min_support: Minimum support count
+        lengths: Pattern lengths to keep (repeat the parameter for several)
+        
+    Returns:
+        Page rows with the number of matching patterns and the filter ranges
+    """
+    viz_generator = get_mining_run(session_id).viz_generator
     
     try:
-        data = viz_generator.prepare_table_data()
-        return {"patterns": data}
+        return viz_generator.prepare_table_page(offset, limit, min_support, lengths)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error preparing table: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/results/summary")
-async def get_summary_stats():
+async def get_summary_stats(session_id: str = Query(...)):
     """Get summary statistics."""
-    global viz_generator, current_sequences, current_patterns
-    
-    if viz_generator is None:
-        raise HTTPException(status_code=400, detail="No mining results available.")
+    run = get_mining_run(session_id)
     
     try:
-        # Get mining parameters from previous operation
-        # In production, store these properly
-        stats = viz_generator.prepare_summary_stats(
-            total_sequences=len(current_sequences),
-            execution_time=0,  # TODO: Store from mining operation
-            min_support=0.01  # TODO: Store from mining operation
+        stats = run.viz_generator.prepare_summary_stats(
+            total_sequences=len(get_session(session_id).sequences),
+            execution_time=run.execution_time,
+            min_support=run.min_support
         )
         return stats
     except Exception as e:
@@ -333,6 +450,67 @@ async def get_summary_stats():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def batch_table_page(session_id: str, op):
+    """Run a batched /results/table operation with the GET handler's bounds."""
+    page = TablePageParams(**op.params)
+    return get_table_data(session_id, page.offset, page.limit, page.min_support, page.lengths)
+
+
+# Operations accepted by /batch, keyed by (method, path); each handler takes
+# the session ID and the operation
+BATCH_OPERATIONS = {
+    ("POST", "/preprocess"): lambda session_id, op: preprocess_data(ColumnSelectionRequest(**(op.body or {})), session_id),
+    ("POST", "/mine"): lambda session_id, op: mine_patterns(MiningParameters(**(op.body or {})), session_id),
+    ("GET", "/visualizations/bar"): lambda session_id, op: get_bar_chart_data(int(op.params.get("top_n", 20)), session_id),
+    ("GET", "/visualizations/line"): lambda session_id, op: get_line_chart_data(session_id),
+    ("GET", "/visualizations/heatmap"): lambda session_id, op: get_heatmap_data(session_id),
+    ("GET", "/visualizations/network"): lambda session_id, op: get_network_data(int(op.params.get("top_n", 15)), session_id),
+    ("GET", "/results/table"): batch_table_page,
+    ("GET", "/results/summary"): lambda session_id, op: get_summary_stats(session_id),
+}
+
+
+@app.post("/batch", response_model=BatchResult)
+async def run_batch(request: BatchRequest, session_id: str = Query(...)):
+    """
+    Run several API operations in one round trip.
+    
+    Operations run in order and the batch stops at the first one that fails,
+    since later operations usually depend on earlier ones (e.g. /mine after
+    /preprocess).
+    
+    Args:
+        request: Operations to run
+        session_id: Session identifier returned by /upload
+        
+    Returns:
+        Status code and body of each operation that ran
+    """
+    unsupported = [f"{op.method} {op.path}" for op in request.operations
+                   if (op.method, op.path) not in BATCH_OPERATIONS]
+    if unsupported:
+        raise HTTPException(status_code=400, detail=f"Unsupported batch operations: {unsupported}")
+    
+    results = []
+    for op in request.operations:
+        try:
+            body = await BATCH_OPERATIONS[(op.method, op.path)](session_id, op)
+            results.append({"path": op.path, "status_code": 200, "body": jsonable_encoder(body)})
+        except HTTPException as e:
+            results.append({"path": op.path, "status_code": e.status_code, "body": {"detail": e.detail}})
+            break
+        except ValueError as e:
+            # Invalid operation body or parameters
+            if isinstance(e, ValidationError):
+                detail = e.errors(include_url=False, include_context=False)
+            else:
+                detail = str(e)
+            results.append({"path": op.path, "status_code": 422, "body": {"detail": detail}})
+            break
+    
+    return {"results": results}
+
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting FastAPI server...")
@@ -3,14 +3,217 @@ Sequential pattern mining using PrefixSpan algorithm.
 
 This module implements:
 - PrefixSpan algorithm for sequential pattern mining
-- Support calculation
+- Pseudo-projected databases over integer-encoded sequences
 - Pattern filtering and sorting
 """
 
-from typing import List, Dict, Any, Set, Tuple
-from collections import defaultdict
+from typing import List, Dict, Any, Set, Tuple, Iterator, NamedTuple
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import os
 import time
-from utils import logger
+import numpy as np
+from preprocessing import EncodedSequences
+from utils import logger, njit
+
+
+# Number of top patterns kept in memory by PrefixSpan.mine_patterns
+DEFAULT_MAX_PATTERNS = 10_000
+
+
+class MinedPattern(NamedTuple):
+    """A frequent pattern whose items are still encoded (see decode_pattern)."""
+    
+    sequence_ids: Tuple[int, ...]
+    support: int
+    support_percent: float
+    length: int
+
+
+@njit(cache=True, nogil=True)
+def _frequent_projected_items(items: np.ndarray, offsets: np.ndarray,
+                              pointers: np.ndarray, min_count: int,
+                              counts: np.ndarray, last_seen: np.ndarray,
+                              touched: np.ndarray, stamp: int):
+    """
+    Find the items that are frequent within a projection.
+    
+    The scratch arrays are shared by every node of a subtree: ``counts`` is
+    all zeros on entry and reset on exit by walking only the touched items,
+    and ``last_seen`` holds a stamp that is unique per projected suffix, so
+    each node costs time proportional to its suffixes, not the vocabulary.
+    
+    Args:
+        items: Flat array of encoded items for all sequences
+        offsets: Start of each sequence in ``items`` (length n_sequences + 1)
+        pointers: (sequence index, start position) rows of the projection
+        min_count: Minimum support count
+        counts: Per-item scratch counters (n_items, all zero)
+        last_seen: Per-item stamp of the last suffix that counted the item
+        touched: Scratch list of items counted so far (n_items)
+        stamp: Last stamp used in ``last_seen``
+        
+    Returns:
+        Tuple of (frequent item ids in ascending order, their supports,
+        last stamp used)
+    """
+    n_touched = 0
+    for k in range(pointers.shape[0]):
+        stamp += 1
+        seq_idx = pointers[k, 0]
+        for pos in range(pointers[k, 1], offsets[seq_idx + 1]):
+            item = items[pos]
+            if last_seen[item] != stamp:
+                last_seen[item] = stamp
+                if counts[item] == 0:
+                    touched[n_touched] = item
+                    n_touched += 1
+                counts[item] += 1
+    
+    frequent = np.empty(n_touched, dtype=np.int32)
+    supports = np.empty(n_touched, dtype=np.int64)
+    n_frequent = 0
+    for i in range(n_touched):
+        item = touched[i]
+        if counts[item] >= min_count:
+            frequent[n_frequent] = item
+            supports[n_frequent] = counts[item]
+            n_frequent += 1
+        counts[item] = 0
+    
+    order = np.argsort(frequent[:n_frequent])
+    return frequent[:n_frequent][order], supports[:n_frequent][order], stamp
+
+
+@njit(cache=True, nogil=True)
+def _project_pointers(items: np.ndarray, offsets: np.ndarray,
+                      pointers: np.ndarray, item: int) -> np.ndarray:
+    """
+    Advance each pointer just past the next occurrence of an item.
+    
+    Args:
+        items: Flat array of encoded items for all sequences
+        offsets: Start of each sequence in ``items`` (length n_sequences + 1)
+        pointers: (sequence index, start position) rows to extend
+        item: Item id to match
+        
+    Returns:
+        Pointers for the suffixes that contain the item and still have
+        items after it; exhausted suffixes cannot extend the pattern
+    """
+    projected = np.empty_like(pointers)
+    n_projected = 0
+    for k in range(pointers.shape[0]):
+        seq_idx = pointers[k, 0]
+        end = offsets[seq_idx + 1]
+        for pos in range(pointers[k, 1], end):
+            if items[pos] == item:
+                if pos + 1 < end:
+                    projected[n_projected, 0] = seq_idx
+                    projected[n_projected, 1] = pos + 1
+                    n_projected += 1
+                break
+    return projected[:n_projected]
+
+
+@njit(cache=True, nogil=True)
+def _grow(buffer: np.ndarray, min_size: int) -> np.ndarray:
+    """Return a copy of ``buffer`` with capacity for at least ``min_size`` entries."""
+    grown = np.empty(max(2 * buffer.shape[0], min_size), dtype=buffer.dtype)
+    grown[:buffer.shape[0]] = buffer
+    return grown
+
+
+@njit(cache=True, nogil=True)
+def _mine_subtree(items: np.ndarray, offsets: np.ndarray, root_item: int,
+                  root_pointers: np.ndarray, n_items: int, min_count: int,
+                  max_length: int):
+    """
+    Depth-first PrefixSpan below a single frequent item.
+    
+    Args:
+        items: Flat array of encoded items for all sequences
+        offsets: Start of each sequence in ``items`` (length n_sequences + 1)
+        root_item: Frequent item that prefixes every pattern in the subtree
+        root_pointers: Projection of the database on ``root_item``
+        n_items: Size of the item vocabulary
+        min_count: Minimum support count
+        max_length: Maximum pattern length (0 for unlimited)
+        
+    Returns:
+        Tuple of (concatenated pattern items, pattern lengths, supports)
+        for every frequent pattern longer than the root item
+    """
+    pattern_items = np.empty(64, dtype=np.int32)
+    pattern_lengths = np.empty(16, dtype=np.int64)
+    supports = np.empty(16, dtype=np.int64)
+    n_pattern_items = 0
+    n_patterns = 0
+    
+    # Counting scratch, allocated once and reused by every node
+    counts = np.zeros(n_items, dtype=np.int64)
+    last_seen = np.full(n_items, -1, dtype=np.int64)
+    touched = np.empty(n_items, dtype=np.int32)
+    stamp = -1
+    
+    # Explicit DFS stack; each frame walks the frequent items of its projection
+    root_prefix = np.empty(1, dtype=np.int32)
+    root_prefix[0] = root_item
+    root_frequent, root_supports, stamp = _frequent_projected_items(
+        items, offsets, root_pointers, min_count, counts, last_seen, touched, stamp
+    )
+    stack_pointers = [root_pointers]
+    stack_prefix = [root_prefix]
+    stack_frequent = [root_frequent]
+    stack_supports = [root_supports]
+    stack_cursor = [0]
+    
+    while len(stack_pointers) > 0:
+        top = len(stack_pointers) - 1
+        frequent = stack_frequent[top]
+        cursor = stack_cursor[top]
+        if cursor == frequent.shape[0]:
+            stack_pointers.pop()
+            stack_prefix.pop()
+            stack_frequent.pop()
+            stack_supports.pop()
+            stack_cursor.pop()
+            continue
+        stack_cursor[top] = cursor + 1
+        
+        item = frequent[cursor]
+        prefix = stack_prefix[top]
+        length = prefix.shape[0] + 1
+        pattern = np.empty(length, dtype=np.int32)
+        pattern[:length - 1] = prefix
+        pattern[length - 1] = item
+        
+        # Record the pattern
+        if n_pattern_items + length > pattern_items.shape[0]:
+            pattern_items = _grow(pattern_items, n_pattern_items + length)
+        pattern_items[n_pattern_items:n_pattern_items + length] = pattern
+        n_pattern_items += length
+        if n_patterns == pattern_lengths.shape[0]:
+            pattern_lengths = _grow(pattern_lengths, n_patterns + 1)
+            supports = _grow(supports, n_patterns + 1)
+        pattern_lengths[n_patterns] = length
+        supports[n_patterns] = stack_supports[top][cursor]
+        n_patterns += 1
+        
+        # Descend if within length limit
+        if max_length <= 0 or length < max_length:
+            child_pointers = _project_pointers(items, offsets, stack_pointers[top], item)
+            child_frequent, child_supports, stamp = _frequent_projected_items(
+                items, offsets, child_pointers, min_count, counts, last_seen, touched, stamp
+            )
+            stack_pointers.append(child_pointers)
+            stack_prefix.append(pattern)
+            stack_frequent.append(child_frequent)
+            stack_supports.append(child_supports)
+            stack_cursor.append(0)
+    
+    return pattern_items[:n_pattern_items], pattern_lengths[:n_patterns], supports[:n_patterns]
 
 
 class PrefixSpan:
@@ -24,231 +227,255 @@ class PrefixSpan:
     """
     
     def __init__(self, sequences: List[List[str]], min_support: float, 
-                 max_pattern_length: int = None):
+                 max_pattern_length: int = None, max_patterns: int = DEFAULT_MAX_PATTERNS,
+                 max_threads: int = None):
         """
         Initialize PrefixSpan miner.
         
         Args:
-            sequences: List of sequences (each sequence is a list of items)
+            sequences: List of sequences (each sequence is a list of items);
+                EncodedSequences are used without re-encoding
             min_support: Minimum support threshold (0.0 to 1.0)
             max_pattern_length: Maximum pattern length (None for unlimited)
+            max_patterns: Number of top patterns kept by mine_patterns()
+            max_threads: Threads mining subtrees in parallel (None for one
+                per CPU)
         """
         self.sequences = sequences
         self.min_support = min_support
         self.max_pattern_length = max_pattern_length
+        self.max_patterns = max_patterns
+        self.max_threads = max_threads
         self.min_support_count = max(1, int(min_support * len(sequences)))
-        self.frequent_patterns: List[Dict[str, Any]] = []
+        self.frequent_patterns: List[MinedPattern] = []
+        self.total_patterns = 0
         self.total_sequences = len(sequences)
+        self.length_stats: Dict[int, List[int]] = {}
+        self._topk_heap: List[Tuple[int, int, int, MinedPattern]] = []
+        self._item_counts: np.ndarray = None
+        self._item_projections: np.ndarray = None
+        self._item_projection_bounds: np.ndarray = None
+        
+        # Integer-encode items into one flat array with per-sequence offsets.
+        # The vocabulary is sorted, so item ids follow item-name order.
+        if isinstance(sequences, EncodedSequences):
+            self._inv_vocab: List[str] = sequences.vocabulary
+            self._items = sequences.items
+            self._offsets = sequences.offsets
+        else:
+            self._inv_vocab = sorted(set().union(*sequences))
+            vocab = {item: item_id for item_id, item in enumerate(self._inv_vocab)}
+            encoded = array('i')
+            lengths = np.empty(self.total_sequences, dtype=np.int64)
+            for seq_idx, sequence in enumerate(sequences):
+                encoded.extend(map(vocab.__getitem__, sequence))
+                lengths[seq_idx] = len(sequence)
+            self._items = np.frombuffer(encoded, dtype=np.int32)
+            self._offsets = np.zeros(self.total_sequences + 1, dtype=np.int64)
+            np.cumsum(lengths, out=self._offsets[1:])
         
         logger.info(f"Initialized PrefixSpan with {self.total_sequences} sequences")
         logger.info(f"Min support: {min_support} ({self.min_support_count} sequences)")
     
-    def mine_patterns(self) -> List[Dict[str, Any]]:
+    def mine_patterns(self) -> List[MinedPattern]:
         """
         Execute the PrefixSpan algorithm to mine frequent patterns.
         
+        Only the top ``max_patterns`` patterns by support and length are kept;
+        ``total_patterns`` records how many were found in total and
+        ``length_stats`` aggregates the support of all of them by length.
+        
+        Patterns keep their items encoded as ``sequence_ids``; use decode()
+        on the ones that are actually returned.
+        
         Returns:
             List of frequent patterns with support information
         """
         logger.info("Starting PrefixSpan mining...")
         start_time = time.time()
         
-        # Find frequent 1-patterns (single items)
-        frequent_items = self._find_frequent_items()
-        
-        # Mine patterns recursively
-        for item in frequent_items:
-            pattern = [item]
-            support = self._calculate_support(pattern)
-            
-            # Add this pattern
+        self._topk_heap = []
+        self.total_patterns = 0
+        self.length_stats = {}
+        for pattern, support in self._iter_patterns():
             self._add_pattern(pattern, support)
-            
-            # Build projected database and mine recursively
-            if self.max_pattern_length is None or len(pattern) < self.max_pattern_length:
-                projected_db = self._build_projected_database(pattern)
-                self._mine_recursive(pattern, projected_db, 2)
         
         execution_time = time.time() - start_time
         logger.info(f"Mining completed in {execution_time:.2f} seconds")
-        logger.info(f"Found {len(self.frequent_patterns)} frequent patterns")
+        logger.info(f"Found {self.total_patterns} frequent patterns")
         
-        # Sort patterns by support (descending) and length (descending)
-        self.frequent_patterns.sort(key=lambda x: (-x['support'], -x['length']))
+        # Sort kept patterns by support (descending) and length (descending).
+        # Only the top max_patterns were kept, so this is a partial sort of
+        # everything found; the heap is sorted in place and then released.
+        self._topk_heap.sort(reverse=True)
+        self.frequent_patterns = [entry[-1] for entry in self._topk_heap]
+        self._topk_heap = []
         
         return self.frequent_patterns
     
-    def _find_frequent_items(self) -> List[str]:
+    def mine_patterns_stream(self) -> Iterator[Dict[str, Any]]:
         """
-        Find all frequent single items.
+        Mine frequent patterns without keeping them in memory.
         
-        Returns:
-            List of frequent items
+        Yields:
+            Every frequent pattern (decoded), in mining order
         """
-        item_counts = defaultdict(int)
-        
-        for sequence in self.sequences:
-            unique_items = set(sequence)
-            for item in unique_items:
-                item_counts[item] += 1
-        
-        frequent_items = [
-            item for item, count in item_counts.items() 
-            if count >= self.min_support_count
-        ]
-        
-        logger.info(f"Found {len(frequent_items)} frequent single items")
-        return sorted(frequent_items)
+        for pattern, support in self._iter_patterns():
+            yield self.decode(self._make_pattern(pattern, support))
     
-    def _mine_recursive(self, prefix: List[str], projected_db: List[List[str]], 
-                       current_length: int) -> None:
+    def _iter_patterns(self) -> Iterator[Tuple[Tuple[int, ...], int]]:
         """
-        Recursively mine patterns from projected database.
+        Run PrefixSpan and yield each frequent pattern as it is found.
         
-        Args:
-            prefix: Current pattern prefix
-            projected_db: Projected database for this prefix
-            current_length: Current pattern length
+        Yields:
+            Tuples of (pattern item ids, support count)
         """
-        # Check max length constraint
-        if self.max_pattern_length and current_length > self.max_pattern_length:
-            return
-        
-        # Find frequent items in projected database
-        item_counts = defaultdict(int)
-        for sequence in projected_db:
-            unique_items = set(sequence)
-            for item in unique_items:
-                item_counts[item] += 1
-        
-        # Process each frequent item
-        for item, count in item_counts.items():
-            if count >= self.min_support_count:
-                new_pattern = prefix + [item]
-                support = self._calculate_support(new_pattern)
-                
-                # Add this pattern
-                self._add_pattern(new_pattern, support)
-                
-                # Continue mining if within length limit
-                if self.max_pattern_length is None or current_length < self.max_pattern_length:
-                    new_projected_db = self._build_projected_database(new_pattern)
-                    self._mine_recursive(new_pattern, new_projected_db, current_length + 1)
+        # Find frequent 1-patterns (single items)
+        frequent_items = self._find_frequent_items()
+        
+        # Yield the 1-patterns; their support is the per-sequence item count
+        for item in frequent_items:
+            yield (item,), int(self._item_counts[item])
+        
+        # Each frequent item roots an independent subtree. The kernels release
+        # the GIL, so the subtrees are mined in parallel threads.
+        if frequent_items and (self.max_pattern_length is None or self.max_pattern_length > 1):
+            max_workers = min(len(frequent_items), self.max_threads or os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for pattern_items, lengths, supports in pool.map(self._mine_item_subtree, frequent_items):
+                    start = 0
+                    for length, support in zip(lengths.tolist(), supports.tolist()):
+                        yield tuple(pattern_items[start:start + length].tolist()), support
+                        start += length
     
-    def _build_projected_database(self, pattern: List[str]) -> List[List[str]]:
+    def _find_frequent_items(self) -> List[int]:
         """
-        Build projected database for a given pattern.
+        Find all frequent single items.
         
-        Args:
-            pattern: Pattern to project on
-            
         Returns:
-            Projected database
+            List of frequent item ids, ordered by item name
         """
-        projected_db = []
+        if self._item_counts is None:
+            self._build_item_projections()
         
-        for sequence in self.sequences:
-            suffix = self._find_suffix(sequence, pattern)
-            if suffix:
-                projected_db.append(suffix)
+        frequent_items = np.nonzero(self._item_counts >= self.min_support_count)[0].tolist()
         
-        return projected_db
+        logger.info(f"Found {len(frequent_items)} frequent single items")
+        return frequent_items
     
-    def _find_suffix(self, sequence: List[str], pattern: List[str]) -> List[str]:
+    def _build_item_projections(self) -> None:
         """
-        Find suffix of sequence after pattern occurrence.
+        Compute support counts and projections for every single item at once.
         
-        Args:
-            sequence: Input sequence
-            pattern: Pattern to match
-            
-        Returns:
-            Suffix after pattern, or None if pattern not found
+        Single-item projections are the widest in the mining tree, so they are
+        built in one vectorized pass and kept for reuse instead of scanning
+        every sequence once per frequent item.
         """
-        pattern_len = len(pattern)
-        seq_len = len(sequence)
+        n_items = len(self._inv_vocab)
         
-        # Try to match pattern
-        for i in range(seq_len - pattern_len + 1):
-            match = True
-            pattern_idx = 0
-            
-            for j in range(i, seq_len):
-                if pattern_idx < pattern_len:
-                    if sequence[j] == pattern[pattern_idx]:
-                        pattern_idx += 1
-                    else:
-                        match = False
-                        break
-                else:
-                    break
-            
-            if pattern_idx == pattern_len:
-                # Found match, return suffix
-                end_idx = i + pattern_len
-                if end_idx < seq_len:
-                    return sequence[end_idx:]
-                else:
-                    return []
-        
-        return None
+        # One key per (sequence, item) occurrence; np.unique keeps the first
+        # position of each distinct pair, so each sequence counts an item once
+        seq_ids = np.repeat(np.arange(self.total_sequences, dtype=np.int64), np.diff(self._offsets))
+        keys = seq_ids * n_items + self._items
+        unique_keys, first_positions = np.unique(keys, return_index=True)
+        key_items = unique_keys % n_items if n_items else unique_keys
+        self._item_counts = np.bincount(key_items, minlength=n_items)
+        
+        # Drop pointers with nothing left to extend, then group them by item:
+        # rows [bounds[i], bounds[i + 1]) project on item i
+        key_seqs = seq_ids[first_positions]
+        extendable = first_positions + 1 < self._offsets[key_seqs + 1]
+        key_items = key_items[extendable]
+        order = np.argsort(key_items, kind='stable')
+        self._item_projections = np.column_stack((
+            key_seqs[extendable][order], first_positions[extendable][order] + 1
+        ))
+        self._item_projection_bounds = np.zeros(n_items + 1, dtype=np.int64)
+        np.cumsum(np.bincount(key_items, minlength=n_items), out=self._item_projection_bounds[1:])
     
-    def _calculate_support(self, pattern: List[str]) -> int:
+    def _mine_item_subtree(self, item: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Calculate support count for a pattern.
+        Mine every pattern that extends a single frequent item.
         
         Args:
-            pattern: Pattern to calculate support for
+            item: Frequent item id rooting the subtree
             
         Returns:
-            Support count
+            Tuple of (concatenated pattern items, pattern lengths, supports)
         """
-        count = 0
-        for sequence in self.sequences:
-            if self._pattern_in_sequence(pattern, sequence):
-                count += 1
-        return count
+        pointers = self._item_projections[
+            self._item_projection_bounds[item]:self._item_projection_bounds[item + 1]
+        ]
+        return _mine_subtree(
+            self._items, self._offsets, item, pointers, len(self._inv_vocab),
+            self.min_support_count, self.max_pattern_length or 0
+        )
     
-    def _pattern_in_sequence(self, pattern: List[str], sequence: List[str]) -> bool:
+    def _add_pattern(self, pattern: Tuple[int, ...], support: int) -> None:
         """
-        Check if pattern appears in sequence.
+        Add a frequent pattern to the bounded top-K results.
+        
+        The per-length statistics count every pattern, including those the
+        top-K results do not keep.
         
         Args:
-            pattern: Pattern to search for
-            sequence: Sequence to search in
-            
-        Returns:
-            True if pattern found, False otherwise
+            pattern: Frequent pattern (item ids)
+            support: Support count
         """
-        pattern_idx = 0
-        pattern_len = len(pattern)
+        self.total_patterns += 1
         
-        for item in sequence:
-            if pattern_idx < pattern_len and item == pattern[pattern_idx]:
-                pattern_idx += 1
-                if pattern_idx == pattern_len:
-                    return True
+        # [pattern count, support sum, min support, max support] per length
+        stats = self.length_stats.get(len(pattern))
+        if stats is None:
+            self.length_stats[len(pattern)] = [1, support, support, support]
+        else:
+            stats[0] += 1
+            stats[1] += support
+            if support < stats[2]:
+                stats[2] = support
+            elif support > stats[3]:
+                stats[3] = support
         
-        return False
+        # Min-heap on (support, length); among ties the latest pattern is evicted first
+        key = (support, len(pattern), -self.total_patterns)
+        if len(self._topk_heap) < self.max_patterns:
+            heapq.heappush(self._topk_heap, key + (self._make_pattern(pattern, support),))
+        elif key > self._topk_heap[0][:3]:
+            heapq.heapreplace(self._topk_heap, key + (self._make_pattern(pattern, support),))
     
-    def _add_pattern(self, pattern: List[str], support: int) -> None:
+    def _make_pattern(self, pattern: Tuple[int, ...], support: int) -> MinedPattern:
         """
-        Add a frequent pattern to results.
+        Build the result dictionary for a pattern.
         
         Args:
-            pattern: Frequent pattern
+            pattern: Frequent pattern (item ids)
             support: Support count
+            
+        Returns:
+            Pattern with encoded items and support information; see decode()
         """
         support_percent = round((support / self.total_sequences) * 100, 2)
         
-        self.frequent_patterns.append({
-            'sequence': pattern.copy(),
-            'support': support,
-            'support_percent': support_percent,
-            'length': len(pattern)
-        })
+        return MinedPattern(pattern, support, support_percent, len(pattern))
+    
+    @property
+    def vocabulary(self) -> List[str]:
+        """Items indexed by their encoded id."""
+        return self._inv_vocab
+    
+    def decode(self, pattern: MinedPattern) -> Dict[str, Any]:
+        """
+        Decode a mined pattern's item ids back to item names.
+        
+        Args:
+            pattern: Pattern as stored in ``frequent_patterns``
+            
+        Returns:
+            Pattern with a ``sequence`` of item names
+        """
+        return decode_pattern(pattern, self._inv_vocab)
     
-    def get_top_patterns(self, n: int = 50) -> List[Dict[str, Any]]:
+    def get_top_patterns(self, n: int = 50) -> List[MinedPattern]:
         """
         Get top N patterns by support.
         
@@ -260,7 +487,7 @@ class PrefixSpan:
         """
         return self.frequent_patterns[:n]
     
-    def get_patterns_by_length(self, length: int) -> List[Dict[str, Any]]:
+    def get_patterns_by_length(self, length: int) -> List[MinedPattern]:
         """
         Get all patterns of specific length.
         
@@ -270,4 +497,45 @@ class PrefixSpan:
         Returns:
             Patterns of specified length
         """
-        return [p for p in self.frequent_patterns if p['length'] == length]
+        return [p for p in self.frequent_patterns if p.length == length]
+
+
+def decode_pattern(pattern: MinedPattern, vocabulary: List[str]) -> Dict[str, Any]:
+    """
+    Replace a pattern's encoded ``sequence_ids`` with item names.
+    
+    Args:
+        pattern: Pattern produced by PrefixSpan.mine_patterns()
+        vocabulary: Items indexed by encoded id (PrefixSpan.vocabulary)
+        
+    Returns:
+        Pattern with a ``sequence`` tuple of item names
+    """
+    return {
+        'sequence': tuple(map(vocabulary.__getitem__, pattern.sequence_ids)),
+        'support': pattern.support,
+        'support_percent': pattern.support_percent,
+        'length': pattern.length
+    }
+
+
+def run_mining(sequences: List[List[str]], min_support: float,
+               max_pattern_length: int = None, max_threads: int = None
+               ) -> Tuple[List[MinedPattern], int, Dict[int, List[int]], List[str]]:
+    """
+    Mine patterns in one call, for use as a worker-process task.
+    
+    Args:
+        sequences: List of sequences (each sequence is a list of items)
+        min_support: Minimum support threshold (0.0 to 1.0)
+        max_pattern_length: Maximum pattern length (None for unlimited)
+        max_threads: Threads mining subtrees in parallel (None for one per CPU)
+        
+    Returns:
+        Tuple of (kept encoded patterns sorted by support, total number of
+        patterns found, per-length statistics of all patterns found,
+        vocabulary to decode them with)
+    """
+    miner = PrefixSpan(sequences, min_support, max_pattern_length, max_threads=max_threads)
+    patterns = miner.mine_patterns()
+    return patterns, miner.total_patterns, miner.length_stats, miner.vocabulary
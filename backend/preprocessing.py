@@ -7,11 +7,76 @@ This module handles:
 - Sequence generation from transactional data
 """
 
+from collections.abc import Sequence
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from pandas.tseries.api import guess_datetime_format
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from utils import logger
 
 
+class EncodedSequences(Sequence):
+    """
+    Sequences stored as integer item codes, decoded only on access.
+    
+    Items of all sequences are kept in one flat int32 array with per-sequence
+    offsets. ``vocabulary`` lists the item names by code, sorted and without
+    duplicates. Indexing or iterating yields plain lists of item names, so
+    this can be used wherever a list of sequences is expected.
+    """
+    
+    def __init__(self, items: np.ndarray, offsets: np.ndarray, vocabulary: List[str]):
+        """
+        Wrap encoded sequences.
+        
+        Args:
+            items: Flat array of item codes for all sequences
+            offsets: Start of each sequence in ``items`` (length n_sequences + 1)
+            vocabulary: Sorted item names, indexed by code
+        """
+        self.items = items
+        self.offsets = offsets
+        self.vocabulary = vocabulary
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sequence index out of range")
+        codes = self.items[self.offsets[index]:self.offsets[index + 1]].tolist()
+        return [self.vocabulary[code] for code in codes]
+    
+    def __iter__(self) -> Iterator[List[str]]:
+        names = [self.vocabulary[code] for code in self.items.tolist()]
+        bounds = self.offsets.tolist()
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            yield names[start:end]
+    
+    def lengths(self) -> np.ndarray:
+        """Get the length of every sequence."""
+        return np.diff(self.offsets)
+    
+    def select(self, mask: np.ndarray) -> "EncodedSequences":
+        """
+        Keep the sequences selected by a boolean mask.
+        
+        Args:
+            mask: One flag per sequence
+            
+        Returns:
+            Encoded sequences with the same vocabulary
+        """
+        lengths = self.lengths()
+        offsets = np.zeros(int(mask.sum()) + 1, dtype=np.int64)
+        np.cumsum(lengths[mask], out=offsets[1:])
+        return EncodedSequences(self.items[np.repeat(mask, lengths)], offsets, self.vocabulary)
+
+
 class DataPreprocessor:
     """Handles data preprocessing and sequence generation."""
     
@@ -19,11 +84,13 @@ class DataPreprocessor:
         """
         Initialize the preprocessor with a dataframe.
         
+        The dataframe is not copied; generate_sequences() only reads it.
+        
         Args:
             dataframe: Input pandas DataFrame
         """
-        self.raw_data = dataframe.copy()
-        self.sequences: List[List[str]] = []
+        self.raw_data = dataframe.copy(deep=False)
+        self.sequences = EncodedSequences(np.empty(0, dtype=np.int32), np.zeros(1, dtype=np.int64), [])
         self.sequence_count = 0
         self.unique_items = set()
     
@@ -32,6 +99,9 @@ class DataPreprocessor:
         """
         Generate sequences from transactional data.
         
+        Items are converted to strings and integer-encoded; the sequences
+        are kept encoded (see EncodedSequences).
+        
         Args:
             sequence_id_col: Column name for sequence/user/session ID
             item_col: Column name for items/events
@@ -40,7 +110,8 @@ class DataPreprocessor:
         Returns:
             Dictionary with sequence generation results
         """
-        logger.info(f"Generating sequences using columns: ID={sequence_id_col}, Item={item_col}, Time={timestamp_col}")
+        logger.info("Generating sequences using columns: ID=%s, Item=%s, Time=%s",
+                    sequence_id_col, item_col, timestamp_col)
         
         try:
             # Validate columns exist
@@ -52,47 +123,48 @@ class DataPreprocessor:
             if missing_cols:
                 raise ValueError(f"Missing columns in dataset: {missing_cols}")
             
-            # Clean data
-            df = self.raw_data.copy()
-            
-            # Remove rows with missing values in key columns
-            df = df.dropna(subset=required_cols)
-            logger.info(f"Rows after removing null values: {len(df)}")
-            
-            # Convert item column to string
-            df[item_col] = df[item_col].astype(str)
+            # Clean data: keep only the key columns and remove rows with
+            # missing values in them
+            df = self.raw_data[required_cols].dropna(subset=required_cols)
+            logger.info("Rows after removing null values: %d", len(df))
             
             # Sort by timestamp if provided
+            sort_cols = [sequence_id_col]
             if timestamp_col:
                 try:
-                    df[timestamp_col] = pd.to_datetime(df[timestamp_col], errors='coerce')
+                    if not pd.api.types.is_datetime64_any_dtype(df[timestamp_col]):
+                        # An explicit format keeps parsing on the vectorized
+                        # path; None leaves the format to pandas
+                        fmt = guess_datetime_format(str(df[timestamp_col].iloc[0])) if len(df) else None
+                        df[timestamp_col] = pd.to_datetime(df[timestamp_col], errors='coerce', format=fmt)
                     df = df.dropna(subset=[timestamp_col])
-                    df = df.sort_values([sequence_id_col, timestamp_col])
+                    sort_cols.append(timestamp_col)
                     logger.info("Sorted sequences by timestamp")
                 except Exception as e:
                     logger.warning(f"Could not parse timestamps: {e}. Proceeding without sorting.")
             
-            # Group by sequence ID and create sequences
-            grouped = df.groupby(sequence_id_col)[item_col].apply(list)
-            self.sequences = grouped.tolist()
+            # Group by sequence ID and create sequences: after a stable sort
+            # each sequence is a contiguous run of rows (no per-group Python
+            # callback)
+            df = df.sort_values(sort_cols, kind='stable')
+            items, vocabulary = self._encode_items(df[item_col])
+            offsets = self._run_offsets(df[sequence_id_col])
+            self.sequences = EncodedSequences(items, offsets, vocabulary)
             self.sequence_count = len(self.sequences)
+            self.unique_items = set(vocabulary)
             
-            # Collect unique items
-            for sequence in self.sequences:
-                self.unique_items.update(sequence)
-            
-            logger.info(f"Generated {self.sequence_count} sequences with {len(self.unique_items)} unique items")
+            logger.info("Generated %d sequences with %d unique items", self.sequence_count, len(self.unique_items))
             
             # Generate statistics
-            sequence_lengths = [len(seq) for seq in self.sequences]
+            length_stats = self._compute_length_stats()
             
             result = {
                 "total_sequences": self.sequence_count,
                 "unique_items": len(self.unique_items),
-                "avg_sequence_length": sum(sequence_lengths) / len(sequence_lengths) if sequence_lengths else 0,
-                "min_sequence_length": min(sequence_lengths) if sequence_lengths else 0,
-                "max_sequence_length": max(sequence_lengths) if sequence_lengths else 0,
-                "sample_sequences": [self.sequences[i] for i in range(min(5, len(self.sequences)))]
+                "avg_sequence_length": length_stats["mean"],
+                "min_sequence_length": length_stats["min"],
+                "max_sequence_length": length_stats["max"],
+                "sample_sequences": self.sequences[:5]
             }
             
             return result
@@ -101,12 +173,54 @@ class DataPreprocessor:
             logger.error(f"Error generating sequences: {str(e)}")
             raise ValueError(f"Failed to generate sequences: {str(e)}")
     
-    def get_sequences(self) -> List[List[str]]:
+    @staticmethod
+    def _encode_items(items: pd.Series) -> Tuple[np.ndarray, List[str]]:
+        """
+        Convert items to strings and encode them as sorted vocabulary codes.
+        
+        Only the distinct values are converted to strings.
+        
+        Args:
+            items: Item column
+            
+        Returns:
+            Tuple of (int32 item codes, sorted item names)
+        """
+        codes, uniques = pd.factorize(items)
+        names = np.array([str(value) for value in uniques], dtype=object)
+        # Sorts the names and merges values that stringify alike (e.g. 1 and '1')
+        vocabulary, remap = np.unique(names, return_inverse=True)
+        return remap.astype(np.int32)[codes], vocabulary.tolist()
+    
+    @staticmethod
+    def _run_offsets(ids: pd.Series) -> np.ndarray:
+        """
+        Find where each run of equal sequence IDs starts.
+        
+        Args:
+            ids: Sequence IDs, sorted so equal IDs are adjacent
+            
+        Returns:
+            Start of each run, followed by the total length
+        """
+        if isinstance(ids.dtype, pd.CategoricalDtype):
+            values = ids.cat.codes.to_numpy()
+        else:
+            values = ids.to_numpy()
+            if values.dtype == object:
+                # Hashing strings once is faster than comparing object pairs
+                values, _ = pd.factorize(values)
+        bounds = np.flatnonzero(values[1:] != values[:-1]) + 1
+        if len(values) == 0:
+            return np.zeros(1, dtype=np.int64)
+        return np.concatenate(([0], bounds, [len(values)])).astype(np.int64)
+    
+    def get_sequences(self) -> EncodedSequences:
         """
         Get the generated sequences.
         
         Returns:
-            List of sequences
+            Encoded sequences, usable as a list of item lists
         """
         if not self.sequences:
             raise ValueError("No sequences generated. Call generate_sequences() first.")
@@ -116,10 +230,15 @@ class DataPreprocessor:
         """
         Get list of unique items across all sequences.
         
+        The sequences' vocabulary is already sorted and holds exactly these
+        items, so it is returned as is instead of sorting ``unique_items``
+        again; callers must not modify it. Filtering removes sequences but
+        never changes the vocabulary.
+        
         Returns:
             Sorted list of unique items
         """
-        return sorted(list(self.unique_items))
+        return self.sequences.vocabulary
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -135,15 +254,33 @@ class DataPreprocessor:
                 "avg_sequence_length": 0
             }
         
-        sequence_lengths = [len(seq) for seq in self.sequences]
+        length_stats = self._compute_length_stats()
         
         return {
             "total_sequences": self.sequence_count,
             "unique_items": len(self.unique_items),
-            "avg_sequence_length": round(sum(sequence_lengths) / len(sequence_lengths), 2),
-            "min_sequence_length": min(sequence_lengths),
-            "max_sequence_length": max(sequence_lengths),
-            "total_transactions": sum(sequence_lengths)
+            "avg_sequence_length": round(length_stats["mean"], 2),
+            "min_sequence_length": length_stats["min"],
+            "max_sequence_length": length_stats["max"],
+            "total_transactions": length_stats["sum"]
+        }
+    
+    def _compute_length_stats(self) -> Dict[str, Any]:
+        """
+        Compute sequence length statistics in one array pass.
+        
+        Returns:
+            Dictionary with sum, min, max and mean sequence length
+        """
+        lengths = self.sequences.lengths()
+        if lengths.size == 0:
+            return {"sum": 0, "min": 0, "max": 0, "mean": 0}
+        total = int(lengths.sum())
+        return {
+            "sum": total,
+            "min": int(lengths.min()),
+            "max": int(lengths.max()),
+            "mean": total / lengths.size
         }
     
     def filter_sequences(self, min_length: int = 2, max_length: int = None) -> int:
@@ -159,13 +296,14 @@ class DataPreprocessor:
         """
         original_count = len(self.sequences)
         
-        filtered = [seq for seq in self.sequences if len(seq) >= min_length]
+        lengths = self.sequences.lengths()
+        keep = lengths >= min_length
         
         if max_length:
-            filtered = [seq for seq in filtered if len(seq) <= max_length]
+            keep &= lengths <= max_length
         
-        self.sequences = filtered
+        self.sequences = self.sequences.select(keep)
         self.sequence_count = len(self.sequences)
         
-        logger.info(f"Filtered sequences: {original_count} -> {self.sequence_count}")
+        logger.info("Filtered sequences: %d -> %d", original_count, self.sequence_count)
         return self.sequence_count
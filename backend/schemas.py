@@ -7,8 +7,8 @@ This module defines all data models used in the API for:
 - Type safety
 """
 
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import List, Optional, Dict, Any, Literal
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class ColumnSelectionRequest(BaseModel):
@@ -18,14 +18,17 @@ class ColumnSelectionRequest(BaseModel):
     item_column: str = Field(..., description="Column representing items/events")
     timestamp_column: Optional[str] = Field(None, description="Optional timestamp column for ordering")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra='forbid',
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "sequence_id_column": "UserID",
                 "item_column": "Product",
                 "timestamp_column": "Date"
             }
         }
+    )
 
 
 class MiningParameters(BaseModel):
@@ -34,20 +37,24 @@ class MiningParameters(BaseModel):
     min_support: float = Field(0.01, ge=0.001, le=1.0, description="Minimum support threshold (0.001-1.0)")
     max_sequence_length: Optional[int] = Field(None, ge=2, le=10, description="Maximum pattern length")
     
-    @validator('min_support')
+    @field_validator('min_support')
+    @classmethod
     def validate_support(cls, v):
         """Ensure minimum support is valid."""
         if not 0.001 <= v <= 1.0:
             raise ValueError('Minimum support must be between 0.001 and 1.0')
         return v
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra='forbid',
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "min_support": 0.05,
                 "max_sequence_length": 5
             }
         }
+    )
 
 
 class PreprocessingRequest(BaseModel):
@@ -55,6 +62,8 @@ class PreprocessingRequest(BaseModel):
     
     columns: ColumnSelectionRequest
     parameters: MiningParameters
+    
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
 
 class SequencePattern(BaseModel):
@@ -65,8 +74,10 @@ class SequencePattern(BaseModel):
     support_percent: float = Field(..., description="Support percentage")
     length: int = Field(..., description="Pattern length")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra='forbid',
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "sequence": ["A", "B", "C"],
                 "support": 150,
@@ -74,6 +85,7 @@ class SequencePattern(BaseModel):
                 "length": 3
             }
         }
+    )
 
 
 class MiningResult(BaseModel):
@@ -85,8 +97,10 @@ class MiningResult(BaseModel):
     min_support_used: float = Field(..., description="Minimum support threshold used")
     execution_time: float = Field(..., description="Execution time in seconds")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra='forbid',
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "patterns": [
                     {
@@ -102,6 +116,7 @@ class MiningResult(BaseModel):
                 "execution_time": 2.5
             }
         }
+    )
 
 
 class DatasetPreview(BaseModel):
@@ -112,17 +127,90 @@ class DatasetPreview(BaseModel):
     columns: List[str]
     preview_data: List[Dict[str, Any]]
     file_size: str
+    session_id: str = Field(..., description="Identifier to pass to the other endpoints")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "filename": "transactions.csv",
                 "rows": 10000,
                 "columns": ["UserID", "Product", "Date"],
                 "preview_data": [{"UserID": 1, "Product": "A", "Date": "2023-01-01"}],
-                "file_size": "512 KB"
+                "file_size": "512 KB",
+                "session_id": "3f2a9c0d5e7b41a8b6c1d2e3f4a5b6c7"
+            }
+        }
+    )
+
+
+class TablePageParams(BaseModel):
+    """Filter and pagination of the results table."""
+    
+    offset: int = Field(0, ge=0, description="Number of matching patterns to skip")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of rows to return")
+    min_support: int = Field(0, ge=0, description="Minimum support count")
+    lengths: Optional[List[int]] = Field(None, description="Pattern lengths to keep")
+    
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+
+class BatchOperation(BaseModel):
+    """A single API call inside a batch request."""
+    
+    method: Literal["GET", "POST"] = Field(..., description="HTTP method of the operation")
+    path: str = Field(..., description="Endpoint path, e.g. /mine")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Query parameters (session_id excluded)")
+    body: Optional[Dict[str, Any]] = Field(None, description="JSON body for POST operations")
+    
+    model_config = ConfigDict(
+        extra='forbid',
+        frozen=True,
+        json_schema_extra={
+            "example": {
+                "method": "POST",
+                "path": "/mine",
+                "body": {"min_support": 0.05, "max_sequence_length": 5}
+            }
+        }
+    )
+
+
+class BatchRequest(BaseModel):
+    """Several API calls sent in one request."""
+    
+    operations: List[BatchOperation] = Field(..., min_length=1, description="Operations, run in order")
+    
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+
+class BatchOperationResult(BaseModel):
+    """Outcome of one operation of a batch."""
+    
+    path: str = Field(..., description="Endpoint path of the operation")
+    status_code: int = Field(..., description="HTTP status the endpoint would have returned")
+    body: Any = Field(..., description="Response body the endpoint would have returned")
+    
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+
+class BatchResult(BaseModel):
+    """Results of a batch request."""
+    
+    results: List[BatchOperationResult] = Field(..., description="Results of the operations that ran")
+    
+    model_config = ConfigDict(
+        extra='forbid',
+        frozen=True,
+        json_schema_extra={
+            "example": {
+                "results": [
+                    {"path": "/mine", "status_code": 200, "body": {"total_patterns": 50}},
+                    {"path": "/results/summary", "status_code": 200, "body": {"total_patterns": 50}}
+                ]
             }
         }
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -131,10 +219,13 @@ class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
     detail: Optional[str] = Field(None, description="Detailed error information")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra='forbid',
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "error": "Invalid CSV format",
                 "detail": "Missing required columns"
             }
         }
+    )
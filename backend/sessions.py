@@ -0,0 +1,145 @@
+"""
+Session management for the API.
+
+This module handles:
+- Per-upload state (dataset, sequences, mining results)
+- Memoization of mining runs per parameter set
+- Bounded LRU storage of sessions keyed by upload content hash
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from data_loader import DataLoader
+from preprocessing import DataPreprocessor, EncodedSequences
+from visualization_data import VisualizationDataGenerator
+from utils import logger
+
+
+# Maximum number of sessions kept in memory
+MAX_SESSIONS = 8
+
+# Maximum number of mining runs memoized per session
+MAX_MINING_RUNS = 4
+
+
+class MiningRun:
+    """Results of one mining run, kept for reuse with identical parameters."""
+    
+    def __init__(self, result: Dict[str, Any], viz_generator: VisualizationDataGenerator,
+                 min_support: float, execution_time: float):
+        """
+        Store the outputs of a mining run.
+        
+        Args:
+            result: Response payload returned by /mine
+            viz_generator: Visualization generator built from the patterns
+            min_support: Minimum support threshold used
+            execution_time: Mining time in seconds
+        """
+        self.result = result
+        self.viz_generator = viz_generator
+        self.min_support = min_support
+        self.execution_time = execution_time
+
+
+class SessionState:
+    """State of one uploaded dataset across the API workflow."""
+    
+    def __init__(self, data_loader: DataLoader):
+        """
+        Initialize a session for a freshly uploaded dataset.
+        
+        Args:
+            data_loader: Loader holding the uploaded dataset
+        """
+        self.data_loader = data_loader
+        self.preprocessor: Optional[DataPreprocessor] = None
+        self.sequences: Optional[EncodedSequences] = None
+        self.mining_run: Optional[MiningRun] = None
+        self._mining_runs: "OrderedDict[Tuple, MiningRun]" = OrderedDict()
+    
+    def set_sequences(self, preprocessor: DataPreprocessor) -> None:
+        """
+        Store newly generated sequences, discarding results mined from older ones.
+        
+        Args:
+            preprocessor: Preprocessor that generated the sequences
+        """
+        self.preprocessor = preprocessor
+        self.sequences = preprocessor.get_sequences()
+        self.mining_run = None
+        self._mining_runs.clear()
+    
+    def get_mining_run(self, key: Tuple) -> Optional[MiningRun]:
+        """
+        Look up a memoized mining run and make it the current one.
+        
+        Args:
+            key: Mining parameters identifying the run
+            
+        Returns:
+            The memoized run, or None if these parameters were not mined yet
+        """
+        run = self._mining_runs.get(key)
+        if run is not None:
+            self._mining_runs.move_to_end(key)
+            self.mining_run = run
+        return run
+    
+    def add_mining_run(self, key: Tuple, run: MiningRun) -> None:
+        """
+        Memoize a mining run and make it the current one.
+        
+        Args:
+            key: Mining parameters identifying the run
+            run: Results of the run
+        """
+        self._mining_runs[key] = run
+        self._mining_runs.move_to_end(key)
+        while len(self._mining_runs) > MAX_MINING_RUNS:
+            self._mining_runs.popitem(last=False)
+        self.mining_run = run
+
+
+class SessionStore:
+    """Least-recently-used store of sessions keyed by session id."""
+    
+    def __init__(self, max_sessions: int = MAX_SESSIONS):
+        """
+        Initialize an empty store.
+        
+        Args:
+            max_sessions: Number of sessions kept before evicting the oldest
+        """
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+    
+    def get(self, session_id: str) -> Optional[SessionState]:
+        """
+        Get a session and mark it as recently used.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            The session, or None if unknown or evicted
+        """
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+        return session
+    
+    def put(self, session_id: str, session: SessionState) -> None:
+        """
+        Store a session, evicting the least recently used ones beyond capacity.
+        
+        Args:
+            session_id: Session identifier
+            session: Session state
+        """
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            logger.info(f"Evicted session {evicted_id}")
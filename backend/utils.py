@@ -5,6 +5,7 @@ This module provides:
 - Logging configuration
 - Helper functions for file operations
 - Common validation utilities
+- Optional Numba JIT decorator
 """
 
 import logging
@@ -12,6 +13,25 @@ import os
 from datetime import datetime
 from typing import Optional
 
+try:
+    from numba import njit, prange, get_num_threads
+    # Start Numba's worker threads from the importing (main) thread; the TBB
+    # threading layer hangs the interpreter at exit when it is first started
+    # from a request thread
+    get_num_threads()
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback used when Numba is not installed: run the plain Python function."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+    
+    prange = range
+    
+    def get_num_threads() -> int:
+        """Fallback used when Numba is not installed: everything runs serially."""
+        return 1
+
 
 def setup_logging(log_level: str = "INFO") -> logging.Logger:
     """
@@ -7,33 +7,209 @@ This module converts mining results into formats suitable for:
 - Dashboard displays
 """
 
+import csv
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
-from collections import defaultdict, Counter
-from utils import logger, format_sequence_for_display
+from itertools import chain
+from typing import List, Dict, Any, Optional, Tuple
+from mining import MinedPattern
+from preprocessing import EncodedSequences
+from utils import logger, format_sequence_for_display, njit, prange, get_num_threads
+
+
+@njit(cache=True)
+def _count_pairs(items: np.ndarray, offsets: np.ndarray, first: int, last: int,
+                 matrix: np.ndarray) -> None:
+    """
+    Add the item pairs of sequences ``first`` to ``last - 1`` to ``matrix``.
+    
+    Args:
+        items: Distinct item ids of every sequence, concatenated
+        offsets: Start of each sequence in ``items`` (length n_sequences + 1)
+        first: First sequence to count
+        last: End of the sequence range (exclusive)
+        matrix: (n, n) pair counts, updated in place
+    """
+    for s in range(first, last):
+        start = offsets[s]
+        end = offsets[s + 1]
+        for i in range(start, end):
+            item_i = items[i]
+            for j in range(i + 1, end):
+                item_j = items[j]
+                matrix[item_i, item_j] += 1
+                matrix[item_j, item_i] += 1
+
+
+@njit(cache=True)
+def _cooccurrence_matrix(items: np.ndarray, offsets: np.ndarray, n: int) -> np.ndarray:
+    """
+    Count how many sequences contain each pair of items.
+    
+    Args:
+        items: Distinct item ids of every sequence, concatenated
+        offsets: Start of each sequence in ``items`` (length n_sequences + 1)
+        n: Number of item ids
+        
+    Returns:
+        Symmetric (n, n) matrix of pair counts with a zero diagonal
+    """
+    matrix = np.zeros((n, n), dtype=np.int64)
+    _count_pairs(items, offsets, 0, offsets.shape[0] - 1, matrix)
+    return matrix
+
+
+@njit(parallel=True, cache=True)
+def _cooccurrence_matrix_parallel(items: np.ndarray, offsets: np.ndarray, n: int,
+                                  n_blocks: int) -> np.ndarray:
+    """
+    Parallel version of _cooccurrence_matrix.
+    
+    The sequences are split into ``n_blocks`` contiguous blocks, each counted
+    by one thread into its own matrix; the matrices are summed at the end.
+    
+    Args:
+        items: Distinct item ids of every sequence, concatenated
+        offsets: Start of each sequence in ``items`` (length n_sequences + 1)
+        n: Number of item ids
+        n_blocks: Number of blocks (usually the number of threads)
+        
+    Returns:
+        Symmetric (n, n) matrix of pair counts with a zero diagonal
+    """
+    n_sequences = offsets.shape[0] - 1
+    partial = np.zeros((n_blocks, n, n), dtype=np.int64)
+    for b in prange(n_blocks):
+        _count_pairs(items, offsets, b * n_sequences // n_blocks,
+                     (b + 1) * n_sequences // n_blocks, partial[b])
+    return partial.sum(axis=0)
 
 
 class VisualizationDataGenerator:
     """Prepares mining results for visualization."""
     
-    def __init__(self, patterns: List[Dict[str, Any]], sequences: List[List[str]]):
+    def __init__(self, patterns: List[MinedPattern], sequences: List[List[str]],
+                 vocabulary: List[str], total_patterns: Optional[int] = None,
+                 length_stats: Optional[Dict[int, List[int]]] = None):
         """
         Initialize the visualization data generator.
         
         Args:
             patterns: List of mined patterns
             sequences: Original sequences
+            vocabulary: Item names by id, to decode the patterns' encoded
+                ``sequence_ids``. It is the sorted list of all items, so it
+                also spares a pass over ``sequences``.
+            total_patterns: Number of patterns found by mining, when more
+                were found than kept in ``patterns``
+            length_stats: [count, support sum, min support, max support] of
+                all patterns found, by length (PrefixSpan.length_stats);
+                computed from ``patterns`` when omitted
         """
         self.patterns = patterns
         self.sequences = sequences
-        self.all_items = self._extract_all_items()
+        self.total_patterns = len(patterns) if total_patterns is None else total_patterns
+        self.vocabulary = vocabulary
+        self._flat_codes: Optional[np.ndarray] = None
+        self._flat_uniques: Optional[pd.Index] = None
+        self._flat_seq_ids: Optional[np.ndarray] = None
+        self._top_items_cache: Dict[int, List[str]] = {}
+        self._labels: List[str] = []
+        self._columns: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._length_stats = length_stats
+        self._length_columns: Optional[Tuple[np.ndarray, ...]] = None
+        self.all_items = list(vocabulary)
+    
+    def _sequence(self, pattern: MinedPattern) -> List[str]:
+        """Get a pattern's item names."""
+        return [self.vocabulary[item] for item in pattern.sequence_ids]
+    
+    def _pattern_labels(self, n: Optional[int] = None) -> List[str]:
+        """
+        Get display labels of the leading patterns, formatting each only once.
+        
+        Args:
+            n: Number of patterns (None for all)
+            
+        Returns:
+            Labels of the first ``n`` patterns
+        """
+        n = len(self.patterns) if n is None else min(n, len(self.patterns))
+        for pattern in self.patterns[len(self._labels):n]:
+            self._labels.append(format_sequence_for_display(self._sequence(pattern)))
+        return self._labels[:n]
     
-    def _extract_all_items(self) -> List[str]:
-        """Extract all unique items from sequences."""
-        items = set()
-        for sequence in self.sequences:
-            items.update(sequence)
-        return sorted(list(items))
+    def _pattern_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the pattern fields as arrays, gathered in one pass and computed once.
+        
+        Returns:
+            Tuple of (lengths, supports, support percentages), in pattern order
+        """
+        if self._columns is None:
+            if self.patterns:
+                _, supports, support_percents, lengths = zip(*self.patterns)
+            else:
+                supports = support_percents = lengths = ()
+            self._columns = (
+                np.array(lengths, dtype=np.int64),
+                np.array(supports, dtype=np.int64),
+                np.array(support_percents, dtype=np.float64)
+            )
+        return self._columns
+    
+    def _length_stat_columns(self) -> Tuple[np.ndarray, ...]:
+        """
+        Get the per-length statistics of all mined patterns as arrays.
+        
+        Returns:
+            Tuple of (lengths, pattern counts, support sums, min supports,
+            max supports), in ascending length order
+        """
+        if self._length_columns is None:
+            if self._length_stats is not None:
+                lengths = np.array(sorted(self._length_stats), dtype=np.int64)
+                stats = np.array([self._length_stats[length] for length in lengths.tolist()],
+                                 dtype=np.int64).reshape(-1, 4)
+                self._length_columns = (lengths,) + tuple(stats.T)
+            else:
+                # Group the patterns by length: sort once, then reduce each
+                # run of equal lengths
+                lengths, supports, _ = self._pattern_columns()
+                order = np.argsort(lengths, kind='stable')
+                lengths, supports = lengths[order], supports[order]
+                unique_lengths, starts, counts = np.unique(lengths, return_index=True, return_counts=True)
+                if len(starts):
+                    reduced = (np.add.reduceat(supports, starts), np.minimum.reduceat(supports, starts),
+                               np.maximum.reduceat(supports, starts))
+                else:
+                    reduced = (supports, supports, supports)
+                self._length_columns = (unique_lengths, counts) + reduced
+        return self._length_columns
+    
+    def _flatten_sequences(self) -> Tuple[np.ndarray, pd.Index, np.ndarray]:
+        """
+        Get all sequence items as one flat integer-coded array, computed once.
+        
+        Encoded sequences are used as they are; others are factorized.
+        
+        Returns:
+            Tuple of (item codes, items by code, index of the sequence each
+            item belongs to)
+        """
+        if self._flat_codes is None:
+            if isinstance(self.sequences, EncodedSequences):
+                lengths = self.sequences.lengths()
+                self._flat_codes = self.sequences.items
+                self._flat_uniques = pd.Index(self.sequences.vocabulary)
+            else:
+                lengths = np.fromiter(map(len, self.sequences), dtype=np.int64, count=len(self.sequences))
+                flat_items = np.array(list(chain.from_iterable(self.sequences)), dtype=object)
+                codes, uniques = pd.factorize(flat_items)
+                self._flat_codes = codes
+                self._flat_uniques = pd.Index(uniques)
+            self._flat_seq_ids = np.repeat(np.arange(len(self.sequences), dtype=np.int64), lengths)
+        return self._flat_codes, self._flat_uniques, self._flat_seq_ids
     
     def prepare_bar_chart_data(self, top_n: int = 20) -> Dict[str, Any]:
         """
@@ -45,47 +221,36 @@ class VisualizationDataGenerator:
         Returns:
             Dictionary with chart data
         """
-        logger.info(f"Preparing bar chart data for top {top_n} patterns")
+        logger.info("Preparing bar chart data for top %d patterns", top_n)
         
-        top_patterns = self.patterns[:top_n]
-        
-        labels = [format_sequence_for_display(p['sequence']) for p in top_patterns]
-        supports = [p['support'] for p in top_patterns]
-        support_percents = [p['support_percent'] for p in top_patterns]
+        lengths, supports, support_percents = self._pattern_columns()
         
         return {
-            'labels': labels,
-            'support_counts': supports,
-            'support_percents': support_percents,
-            'pattern_lengths': [p['length'] for p in top_patterns]
+            'labels': self._pattern_labels(top_n),
+            'support_counts': supports[:top_n].tolist(),
+            'support_percents': support_percents[:top_n].tolist(),
+            'pattern_lengths': lengths[:top_n].tolist()
         }
     
     def prepare_line_chart_data(self) -> Dict[str, Any]:
         """
         Prepare data for line chart showing support trends by pattern length.
         
+        Covers all mined patterns, not only the kept top patterns.
+        
         Returns:
             Dictionary with chart data
         """
         logger.info("Preparing line chart data for support trends")
         
-        # Group by length
-        length_groups = defaultdict(list)
-        for pattern in self.patterns:
-            length_groups[pattern['length']].append(pattern['support'])
-        
-        lengths = sorted(length_groups.keys())
-        avg_supports = [sum(length_groups[l]) / len(length_groups[l]) for l in lengths]
-        max_supports = [max(length_groups[l]) for l in lengths]
-        min_supports = [min(length_groups[l]) for l in lengths]
-        pattern_counts = [len(length_groups[l]) for l in lengths]
+        lengths, pattern_counts, support_sums, min_supports, max_supports = self._length_stat_columns()
         
         return {
-            'lengths': lengths,
-            'avg_support': avg_supports,
-            'max_support': max_supports,
-            'min_support': min_supports,
-            'pattern_count': pattern_counts
+            'lengths': lengths.tolist(),
+            'avg_support': (support_sums / pattern_counts).tolist(),
+            'max_support': max_supports.tolist(),
+            'min_support': min_supports.tolist(),
+            'pattern_count': pattern_counts.tolist()
         }
     
     def prepare_heatmap_data(self) -> Dict[str, Any]:
@@ -100,30 +265,30 @@ class VisualizationDataGenerator:
         # Limit to top items for performance
         top_items = self._get_top_items(20)
         
-        # Create co-occurrence matrix
-        matrix = defaultdict(lambda: defaultdict(int))
-        
-        for sequence in self.sequences:
-            # Count co-occurrences within sequences
-            unique_seq = list(set(sequence))
-            for i, item1 in enumerate(unique_seq):
-                if item1 in top_items:
-                    for item2 in unique_seq[i+1:]:
-                        if item2 in top_items:
-                            matrix[item1][item2] += 1
-                            matrix[item2][item1] += 1
-        
-        # Convert to list format
-        heatmap_data = []
-        for item1 in top_items:
-            row = []
-            for item2 in top_items:
-                row.append(matrix[item1][item2])
-            heatmap_data.append(row)
+        # Encode the top items and keep each (sequence, item) pair once;
+        # the sorted keys group the items by sequence
+        n = len(top_items)
+        flat_codes, uniques, flat_seq_ids = self._flatten_sequences()
+        code_to_id = np.full(len(uniques), -1, dtype=np.int64)
+        code_to_id[uniques.get_indexer(top_items)] = np.arange(n)
+        item_ids = code_to_id[flat_codes]
+        is_top = item_ids >= 0
+        keys = np.unique(flat_seq_ids[is_top] * max(n, 1) + item_ids[is_top])
+        offsets = np.zeros(len(self.sequences) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // max(n, 1), minlength=len(self.sequences)), out=offsets[1:])
+        
+        # Create co-occurrence matrix, in parallel when several threads are
+        # available
+        pair_items = (keys % max(n, 1)).astype(np.int32)
+        n_blocks = min(get_num_threads(), len(self.sequences))
+        if n_blocks > 1:
+            matrix = _cooccurrence_matrix_parallel(pair_items, offsets, n, n_blocks)
+        else:
+            matrix = _cooccurrence_matrix(pair_items, offsets, n)
         
         return {
             'items': top_items,
-            'matrix': heatmap_data
+            'matrix': matrix.tolist()
         }
     
     def prepare_network_data(self, top_n: int = 15) -> Dict[str, Any]:
@@ -136,37 +301,33 @@ class VisualizationDataGenerator:
         Returns:
             Dictionary with nodes and edges for network graph
         """
-        logger.info(f"Preparing network graph data for top {top_n} patterns")
+        logger.info("Preparing network graph data for top %d patterns", top_n)
         
         # Use top patterns
         top_patterns = self.patterns[:top_n]
         
-        # Extract nodes and edges
+        # Extract nodes and edge (transition) arrays
         nodes = set()
-        edges = []
-        edge_weights = defaultdict(int)
+        sources = []
+        targets = []
+        weights = []
         
         for pattern in top_patterns:
-            sequence = pattern['sequence']
-            support = pattern['support']
+            sequence = self._sequence(pattern)
             
             # Add nodes
             nodes.update(sequence)
             
             # Add edges (transitions)
-            for i in range(len(sequence) - 1):
-                source = sequence[i]
-                target = sequence[i + 1]
-                edge_key = (source, target)
-                edge_weights[edge_key] += support
-        
-        # Format edges
-        for (source, target), weight in edge_weights.items():
-            edges.append({
-                'source': source,
-                'target': target,
-                'weight': weight
-            })
+            sources.extend(sequence[:-1])
+            targets.extend(sequence[1:])
+            weights.extend([pattern.support] * (len(sequence) - 1))
+        
+        # Sum the weights of repeated edges, keeping first-seen order
+        edges = []
+        if weights:
+            edge_frame = pd.DataFrame({'source': sources, 'target': targets, 'weight': weights})
+            edges = edge_frame.groupby(['source', 'target'], sort=False)['weight'].sum().reset_index().to_dict('records')
         
         # Format nodes
         node_list = [{'id': node, 'label': node} for node in nodes]
@@ -176,33 +337,68 @@ class VisualizationDataGenerator:
             'edges': edges
         }
     
-    def prepare_table_data(self) -> List[Dict[str, Any]]:
+    def prepare_table_page(self, offset: int = 0, limit: Optional[int] = None,
+                           min_support: int = 0, lengths: Optional[List[int]] = None) -> Dict[str, Any]:
         """
-        Prepare data for results table.
+        Prepare one page of the results table, filtered by length and support.
+        
+        Only the rows on the page are formatted. Ranks stay those of the full
+        pattern list. The lengths and support range of all patterns are
+        included so clients can build their filters from any page.
         
+        Args:
+            offset: Number of matching patterns to skip
+            limit: Maximum number of rows (None for all remaining)
+            min_support: Minimum support count
+            lengths: Pattern lengths to keep (None for all)
+            
         Returns:
-            List of pattern dictionaries formatted for table display
+            Dictionary with the page rows, the number of matching patterns,
+            the page bounds and the filter ranges
+            
+        Raises:
+            ValueError: If offset is negative or limit is below 1
         """
-        logger.info("Preparing table data")
-        
-        table_data = []
-        for i, pattern in enumerate(self.patterns, 1):
-            table_data.append({
-                'rank': i,
-                'pattern': format_sequence_for_display(pattern['sequence']),
-                'sequence': pattern['sequence'],
-                'length': pattern['length'],
-                'support': pattern['support'],
-                'support_percent': f"{pattern['support_percent']}%"
+        if offset < 0 or (limit is not None and limit < 1):
+            raise ValueError("offset must be >= 0 and limit >= 1")
+        
+        pattern_lengths, supports, _ = self._pattern_columns()
+        mask = supports >= min_support
+        if lengths is not None:
+            mask &= np.isin(pattern_lengths, lengths)
+        matches = np.flatnonzero(mask)
+        page = matches[offset:] if limit is None else matches[offset:offset + limit]
+        
+        rows = []
+        for i in page.tolist():
+            pattern = self.patterns[i]
+            sequence = self._sequence(pattern)
+            rows.append({
+                'rank': i + 1,
+                'pattern': format_sequence_for_display(sequence),
+                'sequence': sequence,
+                'length': pattern.length,
+                'support': pattern.support,
+                'support_percent': f"{pattern.support_percent}%"
             })
         
-        return table_data
+        return {
+            'patterns': rows,
+            'total': len(matches),
+            'offset': offset,
+            'limit': limit,
+            'lengths': np.unique(pattern_lengths).tolist(),
+            'support_range': [int(supports.min()), int(supports.max())] if len(supports) else [0, 0]
+        }
     
     def prepare_summary_stats(self, total_sequences: int, execution_time: float, 
                              min_support: float) -> Dict[str, Any]:
         """
         Prepare summary statistics for dashboard.
         
+        Pattern counts, lengths and supports cover all mined patterns, not
+        only the kept top patterns.
+        
         Args:
             total_sequences: Total number of sequences
             execution_time: Mining execution time
@@ -222,17 +418,16 @@ class VisualizationDataGenerator:
                 'min_support_threshold': min_support
             }
         
-        pattern_lengths = [p['length'] for p in self.patterns]
-        supports = [p['support'] for p in self.patterns]
+        lengths, pattern_counts, _, _, max_supports = self._length_stat_columns()
         
         return {
-            'total_patterns': len(self.patterns),
+            'total_patterns': self.total_patterns,
             'total_sequences': total_sequences,
             'unique_items': len(self.all_items),
-            'avg_pattern_length': round(sum(pattern_lengths) / len(pattern_lengths), 2),
-            'max_pattern_length': max(pattern_lengths),
-            'min_pattern_length': min(pattern_lengths),
-            'max_support': max(supports),
+            'avg_pattern_length': round(float((lengths * pattern_counts).sum() / pattern_counts.sum()), 2),
+            'max_pattern_length': int(lengths.max()),
+            'min_pattern_length': int(lengths.min()),
+            'max_support': int(max_supports.max()),
             'min_support_threshold': min_support,
             'execution_time': round(execution_time, 2)
         }
@@ -245,13 +440,16 @@ class VisualizationDataGenerator:
             n: Number of items to return
             
         Returns:
-            List of top items
+            List of top items (ties in order of first appearance)
         """
-        item_counts = Counter()
-        for sequence in self.sequences:
-            item_counts.update(sequence)
-        
-        return [item for item, count in item_counts.most_common(n)]
+        if n not in self._top_items_cache:
+            flat_codes, uniques, _ = self._flatten_sequences()
+            counts = np.bincount(flat_codes, minlength=len(uniques))
+            present, first_seen = np.unique(flat_codes, return_index=True)
+            # Rank by count (descending), then by first appearance
+            order = np.lexsort((first_seen, -counts[present]))[:n]
+            self._top_items_cache[n] = uniques[present[order]].tolist()
+        return self._top_items_cache[n]
     
     def export_to_csv(self, filepath: str) -> None:
         """
@@ -260,10 +458,21 @@ class VisualizationDataGenerator:
         Args:
             filepath: Path to save CSV file
         """
-        logger.info(f"Exporting patterns to {filepath}")
-        
-        table_data = self.prepare_table_data()
-        df = pd.DataFrame(table_data)
-        df.to_csv(filepath, index=False)
-        
-        logger.info(f"Exported {len(table_data)} patterns to CSV")
+        logger.info("Exporting patterns to %s", filepath)
+        
+        # Write rows straight from the pattern columns, without building the
+        # table data or a DataFrame first
+        lengths, supports, support_percents = self._pattern_columns()
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['rank', 'pattern', 'sequence', 'length', 'support', 'support_percent'])
+            writer.writerows(zip(
+                range(1, len(self.patterns) + 1),
+                self._pattern_labels(),
+                map(self._sequence, self.patterns),
+                lengths.tolist(),
+                supports.tolist(),
+                [f"{percent}%" for percent in support_percents.tolist()]
+            ))
+        
+        logger.info("Exported %d patterns to CSV", len(self.patterns))
@@ -5,14 +5,33 @@ This is the entry point for the frontend interface.
 It orchestrates all components and manages the application flow.
 """
 
+import re
 import streamlit as st
-import sys
+import requests
 from pathlib import Path
+from typing import Optional, Tuple
 
-# Add components to path
-sys.path.append(str(Path(__file__).parent / "components"))
+from components import upload, column_selector, parameters
+from components.api_client import get_session
 
-from components import upload, column_selector, parameters, dashboard, tables
+
+@st.cache_data(show_spinner=False)
+def load_css() -> str:
+    """
+    Read and minify the app stylesheet once, and reuse it on every rerun.
+    
+    The styles have to be sent again on every run (Streamlit drops elements a
+    run does not emit), so comments and whitespace are stripped to keep that
+    payload small.
+    
+    Returns:
+        Minified contents of static/app.css
+    """
+    css = (Path(__file__).parent / "static" / "app.css").read_text(encoding="utf-8")
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return css.replace(": ", ":").strip()
 
 
 # Page configuration
@@ -24,148 +43,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    /* Main header styling */
-    .main-header {
-        font-size: 3.5rem;
-        font-weight: 800;
-        background: linear-gradient(120deg, #1f77b4 0%, #2ca02c 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        padding: 1.5rem 0;
-        margin-bottom: 0.5rem;
-    }
-    
-    .sub-header {
-        font-size: 1.3rem;
-        color: #555;
-        text-align: center;
-        padding-bottom: 2rem;
-        font-weight: 300;
-    }
-    
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 1rem;
-        background-color: #f8f9fa;
-        padding: 0.5rem;
-        border-radius: 10px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        padding: 1rem 2rem;
-        background-color: white;
-        border-radius: 8px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .stTabs [data-baseweb="tab"]:hover {
-        background-color: #e8f4f8;
-        transform: translateY(-2px);
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(120deg, #1f77b4 0%, #2ca02c 100%) !important;
-        color: white !important;
-    }
-    
-    /* Metric container styling */
-    div[data-testid="metric-container"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 1.5rem;
-        border-radius: 12px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        transition: transform 0.3s ease;
-    }
-    
-    div[data-testid="metric-container"]:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 6px 20px rgba(0,0,0,0.15);
-    }
-    
-    div[data-testid="metric-container"] label {
-        color: rgba(255,255,255,0.9) !important;
-        font-weight: 600 !important;
-    }
-    
-    div[data-testid="metric-container"] [data-testid="stMetricValue"] {
-        color: white !important;
-        font-size: 2rem !important;
-        font-weight: 700 !important;
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background: linear-gradient(120deg, #1f77b4 0%, #2ca02c 100%);
-        color: white;
-        border: none;
-        padding: 0.75rem 2rem;
-        border-radius: 8px;
-        font-weight: 600;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 15px rgba(0,0,0,0.2);
-    }
-    
-    /* Progress indicators */
-    .stProgress > div > div {
-        background: linear-gradient(120deg, #1f77b4 0%, #2ca02c 100%);
-    }
-    
-    /* Section separators */
-    hr {
-        margin: 2rem 0;
-        border: none;
-        height: 2px;
-        background: linear-gradient(90deg, transparent, #1f77b4, transparent);
-    }
-    
-    /* Expander styling */
-    .streamlit-expanderHeader {
-        background-color: #f8f9fa;
-        border-radius: 8px;
-        font-weight: 600;
-    }
-    
-    /* Sidebar styling */
-    section[data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #f8f9fa 0%, #e9ecef 100%);
-    }
-    
-    /* File uploader styling */
-    [data-testid="stFileUploader"] {
-        background-color: #f8f9fa;
-        border: 2px dashed #1f77b4;
-        border-radius: 10px;
-        padding: 2rem;
-    }
-    
-    /* Success/Error boxes */
-    .success-box {
-        padding: 1rem;
-        background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
-        border-left: 4px solid #28a745;
-        border-radius: 8px;
-        color: #155724;
-        font-weight: 500;
-    }
-    
-    .stAlert {
-        border-radius: 8px;
-        border-left-width: 4px;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # Backend API URL
 API_URL = "http://localhost:8000"
@@ -218,40 +96,64 @@ def render_header():
         """)
 
 
-def render_sidebar():
-    """Render the sidebar with navigation and status."""
-    with st.sidebar:
-        st.markdown("## 📋 Progress Tracker")
-        
-        # Progress indicators
-        steps = [
-            ("1. Upload Dataset", st.session_state.get('dataset_uploaded', False)),
-            ("2. Preprocess Data", st.session_state.get('preprocessing_done', False)),
-            ("3. Mine Patterns", st.session_state.get('mining_done', False))
-        ]
-        
-        for step, completed in steps:
-            if completed:
-                st.success(f"✅ {step}")
-            else:
-                st.info(f"⏳ {step}")
-        
-        st.markdown("---")
-        
-        # Backend status
-        st.markdown("### 🔌 Backend Status")
-        try:
-            import requests
-            response = requests.get(f"{API_URL}/", timeout=2)
-            if response.status_code == 200:
-                st.success("✅ Connected")
-            else:
-                st.error("❌ Error")
-        except:
-            st.error("❌ Disconnected")
-            st.warning("Start backend: `python backend/main.py`")
+@st.cache_data(ttl="10s", max_entries=1, show_spinner=False)
+def probe_backend(url: str) -> Tuple[bool, Optional[int]]:
+    """
+    Check whether the backend is reachable.
+    
+    The result is cached for a few seconds so that widget reruns do not
+    block on the health check each time.
+    
+    Args:
+        url: Backend health-check URL
         
-        st.markdown("---")
+    Returns:
+        Tuple of (reachable, HTTP status code or None)
+    """
+    try:
+        response = get_session().get(url, timeout=2)
+        return True, response.status_code
+    except requests.exceptions.RequestException:
+        return False, None
+
+
+@st.fragment(run_every="10s")
+def render_sidebar():
+    """
+    Render the sidebar with navigation and status.
+    
+    Runs as a fragment: it refreshes the backend status on its own every few
+    seconds without rerunning the rest of the app.
+    """
+    st.markdown("## 📋 Progress Tracker")
+    
+    # Progress indicators
+    steps = [
+        ("1. Upload Dataset", st.session_state.get('dataset_uploaded', False)),
+        ("2. Preprocess Data", st.session_state.get('preprocessing_done', False)),
+        ("3. Mine Patterns", st.session_state.get('mining_done', False))
+    ]
+    
+    for step, completed in steps:
+        if completed:
+            st.success(f"✅ {step}")
+        else:
+            st.info(f"⏳ {step}")
+    
+    st.markdown("---")
+    
+    # Backend status
+    st.markdown("### 🔌 Backend Status")
+    reachable, status_code = probe_backend(f"{API_URL}/")
+    if not reachable:
+        st.error("❌ Disconnected")
+        st.warning("Start backend: `python backend/main.py`")
+    elif status_code == 200:
+        st.success("✅ Connected")
+    else:
+        st.error("❌ Error")
+    
+    st.markdown("---")
 
 
 def main():
@@ -261,7 +163,8 @@ def main():
     render_header()
     
     # Render sidebar
-    render_sidebar()
+    with st.sidebar:
+        render_sidebar()
     
     # Main content area
     st.markdown("---")
@@ -315,6 +218,10 @@ def main():
                     
                     st.markdown("---")
                     
+                    # Imported here so Plotly and pandas load only once there
+                    # are results to show
+                    from components import dashboard, tables
+                    
                     # Step 4: Visualizations
                     dashboard.render_dashboard(API_URL)
                     
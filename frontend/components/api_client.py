@@ -0,0 +1,141 @@
+"""
+Backend API client for Streamlit frontend.
+
+This component handles:
+- A shared HTTP session for all backend calls
+- Connection pooling and retries
+- Batched backend calls
+- Streaming file uploads
+- JSON decoding, with orjson when installed
+"""
+
+import uuid
+import streamlit as st
+import requests
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, BinaryIO, Iterator
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Size of the file chunks sent by upload_file()
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """
+    Get the HTTP session shared by all backend calls.
+
+    The session is created once per server process and keeps connections
+    to the backend open between reruns. It is shared by all users, so it
+    must not be modified by callers.
+
+    Returns:
+        Pooled requests session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=3)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def decode_json(response: requests.Response) -> Any:
+    """
+    Decode a JSON response body.
+    
+    orjson, when installed, parses the larger chart and table payloads
+    several times faster than the standard json module.
+    
+    Args:
+        response: Backend response
+        
+    Returns:
+        Decoded JSON
+    """
+    return _json_loads(response.content)
+
+
+def batch(api_url: str, operations: List[Dict[str, Any]], timeout: float = 300) -> List[Dict[str, Any]]:
+    """
+    Run several backend operations in one request.
+    
+    The backend runs the operations in order and stops at the first failure,
+    so fewer results than operations may come back.
+    
+    Args:
+        api_url: Base URL of the backend API
+        operations: Operations with 'method', 'path' and optional 'params'
+            and 'body'
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Results with 'path', 'status_code' and 'body', one per operation run
+        
+    Raises:
+        requests.exceptions.HTTPError: If the batch itself is rejected
+    """
+    response = get_session().post(
+        f"{api_url}/batch",
+        json={'operations': operations},
+        params={'session_id': st.session_state.get('session_id')},
+        timeout=timeout
+    )
+    response.raise_for_status()
+    return decode_json(response)['results']
+
+
+def _multipart_chunks(field: str, filename: str, fileobj: BinaryIO,
+                      content_type: str, boundary: str) -> Iterator[bytes]:
+    """
+    Encode a single file as a multipart/form-data body, chunk by chunk.
+    
+    Args:
+        field: Form field name
+        filename: File name sent to the server
+        fileobj: Binary file object, read from its current position
+        content_type: MIME type of the file
+        boundary: Multipart boundary
+        
+    Yields:
+        Parts of the request body
+    """
+    filename = filename.replace('"', '%22')
+    yield (f'--{boundary}\r\n'
+           f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+           f'Content-Type: {content_type}\r\n\r\n').encode()
+    while chunk := fileobj.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+    yield f'\r\n--{boundary}--\r\n'.encode()
+
+
+def upload_file(url: str, filename: str, fileobj: BinaryIO,
+                content_type: str = 'text/csv', timeout: float = 30) -> requests.Response:
+    """
+    Upload a file as the 'file' form field without buffering it.
+    
+    requests builds multipart bodies in memory, so the body is generated
+    here instead and sent with chunked transfer encoding; memory use stays
+    constant whatever the file size.
+    
+    Args:
+        url: Endpoint URL
+        filename: File name sent to the server
+        fileobj: Binary file object, read from the start
+        content_type: MIME type of the file
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Backend response
+    """
+    boundary = uuid.uuid4().hex
+    fileobj.seek(0)
+    return get_session().post(
+        url,
+        data=_multipart_chunks('file', filename, fileobj, content_type, boundary),
+        headers={'Content-Type': f'multipart/form-data; boundary={boundary}'},
+        timeout=timeout
+    )
@@ -9,6 +9,7 @@ This component handles:
 
 import streamlit as st
 import requests
+from components.api_client import get_session, decode_json
 from typing import Optional, Dict, Any
 
 
@@ -16,6 +17,9 @@ def render_column_selector(api_url: str, columns: list) -> Optional[Dict[str, st
     """
     Render the column selection interface.
     
+    The selection takes effect when the form is submitted and is kept in
+    ``st.session_state`` for later reruns.
+    
     Args:
         api_url: Base URL of the backend API
         columns: List of available column names
@@ -26,68 +30,115 @@ def render_column_selector(api_url: str, columns: list) -> Optional[Dict[str, st
     st.markdown("### 🎯 Select Columns for Mining")
     st.markdown("Map your dataset columns to the required fields for sequential pattern mining.")
     
-    # Create two columns layout
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("#### Required Fields")
-        
-        # Sequence ID column
-        sequence_id_col = st.selectbox(
-            "Sequence/User/Session ID Column",
-            options=columns,
-            help="Column that identifies different sequences (e.g., UserID, SessionID, TransactionID)"
-        )
+    # The widgets are batched in a form, so changing them does not rerun the
+    # app until the mapping is confirmed
+    with st.form("column_selection"):
+        # Create two columns layout
+        col1, col2 = st.columns(2)
         
-        # Item column
-        item_col = st.selectbox(
-            "Item/Event Column",
-            options=columns,
-            index=min(1, len(columns)-1) if len(columns) > 1 else 0,
-            help="Column containing items or events in the sequence"
-        )
-    
-    with col2:
-        st.markdown("#### Optional Fields")
-        
-        # Timestamp column (optional)
-        use_timestamp = st.checkbox("Use Timestamp for Ordering", value=False)
+        with col1:
+            st.markdown("#### Required Fields")
+            
+            # Sequence ID column
+            sequence_id_col = st.selectbox(
+                "Sequence/User/Session ID Column",
+                options=columns,
+                help="Column that identifies different sequences (e.g., UserID, SessionID, TransactionID)"
+            )
+            
+            # Item column
+            item_col = st.selectbox(
+                "Item/Event Column",
+                options=columns,
+                index=min(1, len(columns)-1) if len(columns) > 1 else 0,
+                help="Column containing items or events in the sequence"
+            )
         
-        timestamp_col = None
-        if use_timestamp:
-            timestamp_col = st.selectbox(
+        with col2:
+            st.markdown("#### Optional Fields")
+            
+            # Timestamp column (optional); shown up front since a form
+            # cannot react to the checkbox before it is submitted
+            use_timestamp = st.checkbox("Use Timestamp for Ordering", value=False)
+            
+            timestamp_choice = st.selectbox(
                 "Timestamp Column",
                 options=columns,
                 index=min(2, len(columns)-1) if len(columns) > 2 else 0,
-                help="Column containing timestamps for ordering sequences"
+                help="Column containing timestamps for ordering sequences (used when the box above is checked)"
             )
+        
+        submitted = st.form_submit_button("✔️ Confirm Mapping", use_container_width=True)
+    
+    if submitted:
+        timestamp_col = timestamp_choice if use_timestamp else None
+        
+        # Check for duplicate selections
+        if sequence_id_col == item_col or timestamp_col in (sequence_id_col, item_col):
+            st.session_state['column_mapping'] = None
+        else:
+            st.session_state['column_mapping'] = {
+                'sequence_id_column': sequence_id_col,
+                'item_column': item_col,
+                'timestamp_column': timestamp_col
+            }
     
     # Validation
     st.markdown("---")
     
-    # Check for duplicate selections
-    selected_cols = [sequence_id_col, item_col]
-    if timestamp_col:
-        selected_cols.append(timestamp_col)
-    
-    if len(selected_cols) != len(set(selected_cols)):
-        st.warning("⚠️ Please select different columns for each field.")
+    selection = st.session_state.get('column_mapping')
+    if selection is None:
+        if submitted:
+            st.warning("⚠️ Please select different columns for each field.")
+        else:
+            st.info("👆 Confirm the column mapping to continue.")
         return None
     
     # Show selection summary
     with st.expander("📋 Selection Summary", expanded=True):
-        st.write(f"**Sequence ID:** `{sequence_id_col}`")
-        st.write(f"**Item/Event:** `{item_col}`")
-        if timestamp_col:
-            st.write(f"**Timestamp:** `{timestamp_col}`")
+        st.write(f"**Sequence ID:** `{selection['sequence_id_column']}`")
+        st.write(f"**Item/Event:** `{selection['item_column']}`")
+        if selection['timestamp_column']:
+            st.write(f"**Timestamp:** `{selection['timestamp_column']}`")
         else:
             st.write("**Timestamp:** Not selected (sequences will be ordered as they appear)")
     
-    return {
-        'sequence_id_column': sequence_id_col,
-        'item_column': item_col,
-        'timestamp_column': timestamp_col
-    }
+    return selection
+
+
+def request_preprocessing(api_url: str, session_id: str, sequence_id_column: str,
+                          item_column: str, timestamp_column: Optional[str]) -> Dict[str, Any]:
+    """
+    Ask the backend to generate sequences from the selected columns.
+    
+    Not cached: the call replaces the session's sequences on the backend,
+    which may since have restarted or evicted the session.
+    
+    Args:
+        api_url: Base URL of the backend API
+        session_id: Session identifier returned by /upload
+        sequence_id_column: Sequence ID column name
+        item_column: Item column name
+        timestamp_column: Optional timestamp column name
+        
+    Returns:
+        Preprocessing results
+        
+    Raises:
+        requests.exceptions.HTTPError: If the backend rejects the request
+    """
+    response = get_session().post(
+        f"{api_url}/preprocess",
+        json={
+            'sequence_id_column': sequence_id_column,
+            'item_column': item_column,
+            'timestamp_column': timestamp_column
+        },
+        params={'session_id': session_id},
+        timeout=60
+    )
+    response.raise_for_status()
+    return decode_json(response)
 
 
 def preprocess_with_columns(api_url: str, column_selection: Dict[str, str]) -> Optional[Dict[str, Any]]:
@@ -105,27 +156,28 @@ def preprocess_with_columns(api_url: str, column_selection: Dict[str, str]) -> O
         with st.spinner("Preprocessing data and generating sequences..."):
             try:
                 # Send to backend
-                response = requests.post(
-                    f"{api_url}/preprocess",
-                    json=column_selection,
-                    timeout=60
+                result = request_preprocessing(
+                    api_url,
+                    st.session_state.get('session_id'),
+                    column_selection['sequence_id_column'],
+                    column_selection['item_column'],
+                    column_selection['timestamp_column']
                 )
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    st.success("✅ Sequences generated successfully!")
-                    
-                    # Store in session state
-                    st.session_state['preprocessing_done'] = True
-                    st.session_state['preprocessing_result'] = result
-                    
-                    return result
-                else:
-                    error_detail = response.json().get('detail', 'Unknown error')
-                    st.error(f"❌ Preprocessing failed: {error_detail}")
-                    return None
+                st.success("✅ Sequences generated successfully!")
+                
+                # Store in session state
+                st.session_state['preprocessing_done'] = True
+                st.session_state['preprocessing_result'] = result
+                st.session_state['preprocessed_mapping'] = dict(column_selection)
+                st.session_state.pop('results_table', None)
+                
+                return result
                     
+            except requests.exceptions.HTTPError as e:
+                error_detail = e.response.json().get('detail', 'Unknown error')
+                st.error(f"❌ Preprocessing failed: {error_detail}")
+                return None
             except requests.exceptions.ConnectionError:
                 st.error("❌ Cannot connect to backend server.")
                 return None
@@ -169,6 +221,8 @@ def display_preprocessing_results(result: Dict[str, Any]) -> None:
     # Sample sequences
     if 'sample_sequences' in result:
         with st.expander("🔍 Sample Sequences", expanded=False):
-            for i, seq in enumerate(result['sample_sequences'], 1):
-                seq_str = " → ".join(str(item) for item in seq)
-                st.write(f"{i}. {seq_str}")
+            # One markdown block instead of one element per sequence
+            st.markdown("\n".join(
+                f"{i}. {' → '.join(str(item) for item in seq)}"
+                for i, seq in enumerate(result['sample_sequences'], 1)
+            ))
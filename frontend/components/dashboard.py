@@ -8,11 +8,97 @@ This component handles:
 - Heatmaps
 """
 
+from functools import lru_cache
 import streamlit as st
 import requests
+from components.api_client import get_session, batch, decode_json
 import plotly.graph_objects as go
 import plotly.express as px
-from typing import Dict, Any
+from plotly.subplots import make_subplots
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
+
+
+# Dashboard sections loaded together and the backend endpoints they come
+# from; the network graph depends on its slider and is loaded on its own
+DASHBOARD_ENDPOINTS = {
+    'summary': '/results/summary',
+    'bar': '/visualizations/bar',
+    'line': '/visualizations/line',
+    'heatmap': '/visualizations/heatmap'
+}
+
+# Largest bar chart the slider allows; the bar data is always fetched at
+# this size and cut down to the slider value locally
+BAR_TOP_N_MAX = 50
+
+# Network edges are drawn in up to three line widths; these split the
+# 0-5 width range into thin, medium and thick edges
+EDGE_WIDTH_BUCKETS = [5 / 3, 10 / 3]
+
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def fetch_dashboard(api_url: str, session_id: str, run_id: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch the data of the dashboard sections in one backend call.
+    
+    The section requests are sent as a single /batch request. The bar chart
+    data covers BAR_TOP_N_MAX patterns whatever the slider says. Responses are
+    cached per mining run, so reruns (slider moves, tab switches) reuse
+    them instead of calling the backend again. Failed calls raise and are
+    not cached.
+    
+    Args:
+        api_url: Base URL of the backend API
+        session_id: Session identifier returned by /upload
+        run_id: Identifier of the mining run; a new run gets a new ID
+        
+    Returns:
+        Decoded response per section, keyed as in DASHBOARD_ENDPOINTS
+        
+    Raises:
+        requests.exceptions.HTTPError: If the backend returns an error
+    """
+    params = {'bar': {'top_n': BAR_TOP_N_MAX}}
+    results = batch(api_url, [
+        {'method': 'GET', 'path': path, 'params': params.get(section, {})}
+        for section, path in DASHBOARD_ENDPOINTS.items()
+    ], timeout=30)
+    
+    # The backend stops at the first failed operation
+    if len(results) < len(DASHBOARD_ENDPOINTS) or results[-1]['status_code'] != 200:
+        failed = results[-1]
+        raise requests.exceptions.HTTPError(
+            f"{failed['path']} failed: {failed['body'].get('detail', 'Unknown error')}"
+        )
+    
+    return {section: result['body'] for section, result in zip(DASHBOARD_ENDPOINTS, results)}
+
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def fetch_network(api_url: str, session_id: str, run_id: Optional[str], top_n: int) -> Dict[str, Any]:
+    """
+    Fetch the network graph data of the current mining run.
+    
+    Args:
+        api_url: Base URL of the backend API
+        session_id: Session identifier returned by /upload
+        run_id: Identifier of the mining run; a new run gets a new ID
+        top_n: Number of top patterns to include
+        
+    Returns:
+        Nodes and edges of the network
+        
+    Raises:
+        requests.exceptions.HTTPError: If the backend returns an error
+    """
+    response = get_session().get(
+        f"{api_url}/visualizations/network",
+        params={'session_id': session_id, 'top_n': top_n},
+        timeout=30
+    )
+    response.raise_for_status()
+    return decode_json(response)
 
 
 def render_dashboard(api_url: str) -> None:
@@ -25,283 +111,442 @@ def render_dashboard(api_url: str) -> None:
     st.markdown("## 📊 Interactive Visualization Dashboard")
     st.markdown("Explore mined patterns through interactive visualizations.")
     
+    # Load the sections at once
+    try:
+        bundle = fetch_dashboard(
+            api_url,
+            st.session_state.get('session_id'),
+            st.session_state.get('mining_run_id')
+        )
+    except requests.exceptions.HTTPError as e:
+        st.error(f"Failed to load dashboard data: {str(e)}")
+        return
+    except Exception as e:
+        st.error(f"Error loading dashboard data: {str(e)}")
+        return
+    
     # Summary statistics
-    render_summary_statistics(api_url)
+    render_summary_statistics(bundle['summary'])
     
     st.markdown("---")
     
-    # Visualizations in tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📊 Top Patterns",
-        "📈 Support Trends",
-        "🔥 Co-occurrence Heatmap",
-        "🕸️ Sequence Flow Network"
-    ])
+    # Visualizations, one at a time: unlike st.tabs, which runs every tab's
+    # body on each rerun, only the selected view builds and sends its charts
+    view = st.radio(
+        "View",
+        ["📊 Top Patterns", "📈 Support Trends", "🔥 Co-occurrence Heatmap", "🕸️ Sequence Flow Network"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_view"
+    )
     
-    with tab1:
-        render_bar_chart(api_url)
-    
-    with tab2:
-        render_line_chart(api_url)
-    
-    with tab3:
-        render_heatmap(api_url)
-    
-    with tab4:
+    if view == "📊 Top Patterns":
+        render_bar_chart(bundle['bar'])
+    elif view == "📈 Support Trends":
+        render_line_chart(bundle['line'])
+    elif view == "🔥 Co-occurrence Heatmap":
+        render_heatmap(bundle['heatmap'])
+    else:
         render_network_graph(api_url)
 
 
-def render_summary_statistics(api_url: str) -> None:
+def render_summary_statistics(stats: Dict[str, Any]) -> None:
     """
     Render summary statistics cards.
     
     Args:
-        api_url: Base URL of the backend API
+        stats: Summary statistics from /results/summary
     """
     try:
-        response = requests.get(f"{api_url}/results/summary", timeout=30)
+        st.markdown("### 📈 Summary Statistics")
+        
+        # First row of metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total Patterns", f"{stats['total_patterns']:,}")
+        
+        with col2:
+            st.metric("Total Sequences", f"{stats['total_sequences']:,}")
+        
+        with col3:
+            st.metric("Unique Items", stats['unique_items'])
+        
+        with col4:
+            st.metric("Execution Time", f"{stats['execution_time']:.2f}s")
+        
+        # Second row of metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Avg Pattern Length", f"{stats['avg_pattern_length']:.2f}")
+        
+        with col2:
+            st.metric("Max Pattern Length", stats.get('max_pattern_length', 'N/A'))
+        
+        with col3:
+            st.metric("Max Support", stats['max_support'])
+        
+        with col4:
+            st.metric("Min Support Threshold", f"{stats['min_support_threshold']*100:.1f}%")
         
-        if response.status_code == 200:
-            stats = response.json()
-            
-            st.markdown("### 📈 Summary Statistics")
-            
-            # First row of metrics
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Total Patterns", f"{stats['total_patterns']:,}")
-            
-            with col2:
-                st.metric("Total Sequences", f"{stats['total_sequences']:,}")
-            
-            with col3:
-                st.metric("Unique Items", stats['unique_items'])
-            
-            with col4:
-                st.metric("Execution Time", f"{stats['execution_time']:.2f}s")
-            
-            # Second row of metrics
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Avg Pattern Length", f"{stats['avg_pattern_length']:.2f}")
-            
-            with col2:
-                st.metric("Max Pattern Length", stats.get('max_pattern_length', 'N/A'))
-            
-            with col3:
-                st.metric("Max Support", stats['max_support'])
-            
-            with col4:
-                st.metric("Min Support Threshold", f"{stats['min_support_threshold']*100:.1f}%")
-                
     except Exception as e:
         st.error(f"Error loading statistics: {str(e)}")
 
 
-def render_bar_chart(api_url: str) -> None:
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _build_bar_fig(support_counts: Tuple[int, ...], labels: Tuple[str, ...],
+                   support_percents: Tuple[float, ...], top_n: int) -> go.Figure:
+    """
+    Build the top patterns bar chart.
+    
+    Figures are cached on their data, so reruns return the already built
+    figure. The figure is shared, so callers must not modify it.
+    
+    Args:
+        support_counts: Support count per pattern
+        labels: Display label per pattern
+        support_percents: Support percentage per pattern
+        top_n: Number of patterns requested
+        
+    Returns:
+        Bar chart figure
+    """
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=support_counts,
+        y=labels,
+        orientation='h',
+        marker=dict(
+            color=support_percents,
+            colorscale='Viridis',
+            showscale=True,
+            colorbar=dict(title="Support %")
+        ),
+        text=support_percents,
+        texttemplate='%{text:.1f}%',
+        textposition='auto',
+        hovertemplate='<b>%{y}</b><br>Support: %{x}<br>Support: %{text:.1f}%<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title=f"Top {top_n} Sequential Patterns by Support",
+        xaxis_title="Support Count",
+        yaxis_title="Pattern",
+        height=max(400, top_n * 25),
+        showlegend=False,
+        hovermode='closest'
+    )
+    
+    return fig
+
+
+@st.fragment
+def render_bar_chart(data: Dict[str, Any]) -> None:
     """
     Render bar chart of top patterns.
     
+    This is a fragment: moving its slider reruns only this chart.
+    
     Args:
-        api_url: Base URL of the backend API
+        data: Bar chart data from /visualizations/bar
     """
     st.markdown("### 📊 Top Frequent Patterns")
     
     # Parameter for top N
-    top_n = st.slider("Number of patterns to display", 5, 50, 20, 5, key="bar_top_n")
+    top_n = st.slider("Number of patterns to display", 5, BAR_TOP_N_MAX, 20, 5, key="bar_top_n")
     
     try:
-        response = requests.get(f"{api_url}/visualizations/bar?top_n={top_n}", timeout=30)
+        # The data holds the top BAR_TOP_N_MAX patterns; slicing here keeps
+        # slider moves off the network
+        fig = _build_bar_fig(tuple(data['support_counts'][:top_n]), tuple(data['labels'][:top_n]),
+                             tuple(data['support_percents'][:top_n]), top_n)
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.info(f"💡 Showing the {top_n} most frequent patterns. Higher support indicates more common patterns.")
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Create bar chart
-            fig = go.Figure()
-            
-            fig.add_trace(go.Bar(
-                x=data['support_counts'],
-                y=data['labels'],
-                orientation='h',
-                marker=dict(
-                    color=data['support_percents'],
-                    colorscale='Viridis',
-                    showscale=True,
-                    colorbar=dict(title="Support %")
-                ),
-                text=data['support_percents'],
-                texttemplate='%{text:.1f}%',
-                textposition='auto',
-                hovertemplate='<b>%{y}</b><br>Support: %{x}<br>Support: %{text:.1f}%<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                title=f"Top {top_n} Sequential Patterns by Support",
-                xaxis_title="Support Count",
-                yaxis_title="Pattern",
-                height=max(400, top_n * 25),
-                showlegend=False,
-                hovermode='closest'
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            st.info(f"💡 Showing the {top_n} most frequent patterns. Higher support indicates more common patterns.")
-            
-        else:
-            st.error("Failed to load bar chart data.")
-            
     except Exception as e:
         st.error(f"Error rendering bar chart: {str(e)}")
 
 
-def render_line_chart(api_url: str) -> None:
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _build_line_fig(lengths: Tuple[int, ...], avg_support: Tuple[float, ...],
+                    max_support: Tuple[int, ...], min_support: Tuple[int, ...],
+                    pattern_count: Tuple[int, ...]) -> go.Figure:
+    """
+    Build the support trend line chart above the pattern count bar chart.
+    
+    Both charts share one figure (and x axis), so the browser mounts a
+    single Plotly chart for them.
+    
+    Args:
+        lengths: Pattern lengths
+        avg_support: Average support per length
+        max_support: Maximum support per length
+        min_support: Minimum support per length
+        pattern_count: Number of patterns per length
+        
+    Returns:
+        Figure with the line chart in row 1 and the bar chart in row 2
+    """
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        row_heights=[0.55, 0.45],
+        vertical_spacing=0.08,
+        subplot_titles=["Support Statistics by Pattern Length", "Number of Patterns by Length"]
+    )
+    
+    # Average support line
+    fig.add_trace(go.Scatter(
+        x=lengths,
+        y=avg_support,
+        mode='lines+markers',
+        name='Average Support',
+        line=dict(color='blue', width=3),
+        marker=dict(size=10),
+        hovertemplate='Length: %{x}<br>Avg Support: %{y:.1f}<extra></extra>'
+    ), row=1, col=1)
+    
+    # Max support line
+    fig.add_trace(go.Scatter(
+        x=lengths,
+        y=max_support,
+        mode='lines+markers',
+        name='Maximum Support',
+        line=dict(color='green', width=2, dash='dash'),
+        marker=dict(size=8),
+        hovertemplate='Length: %{x}<br>Max Support: %{y}<extra></extra>'
+    ), row=1, col=1)
+    
+    # Min support line
+    fig.add_trace(go.Scatter(
+        x=lengths,
+        y=min_support,
+        mode='lines+markers',
+        name='Minimum Support',
+        line=dict(color='red', width=2, dash='dot'),
+        marker=dict(size=8),
+        hovertemplate='Length: %{x}<br>Min Support: %{y}<extra></extra>'
+    ), row=1, col=1)
+    
+    # Pattern count bar chart
+    fig.add_trace(go.Bar(
+        x=lengths,
+        y=pattern_count,
+        marker_color='lightblue',
+        text=pattern_count,
+        textposition='auto',
+        showlegend=False,
+        hovertemplate='Length: %{x}<br>Pattern Count: %{y}<extra></extra>'
+    ), row=2, col=1)
+    
+    fig.update_xaxes(title_text="Pattern Length", row=2, col=1)
+    fig.update_yaxes(title_text="Support Count", row=1, col=1)
+    fig.update_yaxes(title_text="Number of Patterns", row=2, col=1)
+    
+    fig.update_layout(
+        height=900,
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.05,
+            xanchor="right",
+            x=1
+        )
+    )
+    
+    return fig
+
+
+def render_line_chart(data: Dict[str, Any]) -> None:
     """
     Render line chart showing support trends by pattern length.
     
     Args:
-        api_url: Base URL of the backend API
+        data: Line chart data from /visualizations/line
     """
     st.markdown("### 📈 Support Trends by Pattern Length")
     
     try:
-        response = requests.get(f"{api_url}/visualizations/line", timeout=30)
+        fig = _build_line_fig(tuple(data['lengths']), tuple(data['avg_support']),
+                              tuple(data['max_support']), tuple(data['min_support']),
+                              tuple(data['pattern_count']))
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.info("💡 Longer patterns typically have lower support. This shows the distribution of support across different pattern lengths.")
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Create line chart
-            fig = go.Figure()
-            
-            # Average support line
-            fig.add_trace(go.Scatter(
-                x=data['lengths'],
-                y=data['avg_support'],
-                mode='lines+markers',
-                name='Average Support',
-                line=dict(color='blue', width=3),
-                marker=dict(size=10),
-                hovertemplate='Length: %{x}<br>Avg Support: %{y:.1f}<extra></extra>'
-            ))
-            
-            # Max support line
-            fig.add_trace(go.Scatter(
-                x=data['lengths'],
-                y=data['max_support'],
-                mode='lines+markers',
-                name='Maximum Support',
-                line=dict(color='green', width=2, dash='dash'),
-                marker=dict(size=8),
-                hovertemplate='Length: %{x}<br>Max Support: %{y}<extra></extra>'
-            ))
-            
-            # Min support line
-            fig.add_trace(go.Scatter(
-                x=data['lengths'],
-                y=data['min_support'],
-                mode='lines+markers',
-                name='Minimum Support',
-                line=dict(color='red', width=2, dash='dot'),
-                marker=dict(size=8),
-                hovertemplate='Length: %{x}<br>Min Support: %{y}<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                title="Support Statistics by Pattern Length",
-                xaxis_title="Pattern Length",
-                yaxis_title="Support Count",
-                height=500,
-                hovermode='x unified',
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                )
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Pattern count bar chart
-            fig2 = go.Figure()
-            
-            fig2.add_trace(go.Bar(
-                x=data['lengths'],
-                y=data['pattern_count'],
-                marker_color='lightblue',
-                text=data['pattern_count'],
-                textposition='auto',
-                hovertemplate='Length: %{x}<br>Pattern Count: %{y}<extra></extra>'
-            ))
-            
-            fig2.update_layout(
-                title="Number of Patterns by Length",
-                xaxis_title="Pattern Length",
-                yaxis_title="Number of Patterns",
-                height=400
-            )
-            
-            st.plotly_chart(fig2, use_container_width=True)
-            
-            st.info("💡 Longer patterns typically have lower support. This shows the distribution of support across different pattern lengths.")
-            
-        else:
-            st.error("Failed to load line chart data.")
-            
     except Exception as e:
         st.error(f"Error rendering line chart: {str(e)}")
 
 
-def render_heatmap(api_url: str) -> None:
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _build_heatmap_fig(matrix: Tuple[Tuple[int, ...], ...], items: Tuple[str, ...]) -> go.Figure:
+    """
+    Build the item co-occurrence heatmap.
+    
+    Args:
+        matrix: Co-occurrence counts, one row per item
+        items: Item names
+        
+    Returns:
+        Heatmap figure
+    """
+    # Create heatmap
+    fig = go.Figure(data=go.Heatmap(
+        # An array is sent to the browser as a compact binary buffer
+        z=np.asarray(matrix),
+        x=items,
+        y=items,
+        colorscale='YlOrRd',
+        hovertemplate='%{y} ↔ %{x}<br>Co-occurrence: %{z}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title="Item Co-occurrence Matrix (Top 20 Items)",
+        xaxis_title="Item",
+        yaxis_title="Item",
+        height=600,
+        width=600
+    )
+    
+    return fig
+
+
+def render_heatmap(data: Dict[str, Any]) -> None:
     """
     Render heatmap showing item co-occurrence.
     
     Args:
-        api_url: Base URL of the backend API
+        data: Heatmap data from /visualizations/heatmap
     """
     st.markdown("### 🔥 Item Co-occurrence Heatmap")
     
     try:
-        response = requests.get(f"{api_url}/visualizations/heatmap", timeout=30)
+        fig = _build_heatmap_fig(tuple(map(tuple, data['matrix'])), tuple(data['items']))
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.info("💡 Darker colors indicate items that frequently appear together in sequences. Use this to identify strong item associations.")
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Create heatmap
-            fig = go.Figure(data=go.Heatmap(
-                z=data['matrix'],
-                x=data['items'],
-                y=data['items'],
-                colorscale='YlOrRd',
-                hovertemplate='%{y} ↔ %{x}<br>Co-occurrence: %{z}<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                title="Item Co-occurrence Matrix (Top 20 Items)",
-                xaxis_title="Item",
-                yaxis_title="Item",
-                height=600,
-                width=600
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            st.info("💡 Darker colors indicate items that frequently appear together in sequences. Use this to identify strong item associations.")
-            
-        else:
-            st.error("Failed to load heatmap data.")
-            
     except Exception as e:
         st.error(f"Error rendering heatmap: {str(e)}")
 
 
+@lru_cache(maxsize=64)
+def _circle_positions(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get evenly spaced positions on the unit circle.
+    
+    The layout only depends on the number of nodes, so it is shared by all
+    network figures with that many nodes; the arrays are read-only.
+    
+    Args:
+        n: Number of positions
+        
+    Returns:
+        Tuple of (x coordinates, y coordinates)
+    """
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    xs, ys = np.cos(angles), np.sin(angles)
+    xs.flags.writeable = False
+    ys.flags.writeable = False
+    return xs, ys
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _build_network_fig(nodes: Tuple[Tuple[str, str], ...],
+                       edges: Tuple[Tuple[str, str, int], ...], top_n: int) -> go.Figure:
+    """
+    Build the sequence flow network with a circular layout.
+    
+    Args:
+        nodes: (id, label) per node
+        edges: (source, target, weight) per edge
+        top_n: Number of patterns included
+        
+    Returns:
+        Network figure
+    """
+    # Simple layout - circular
+    node_x, node_y = _circle_positions(len(nodes))
+    node_index = {node_id: i for i, (node_id, _) in enumerate(nodes)}
+    node_text = [label for _, label in nodes]
+    
+    # Draw edges: one trace per width bucket instead of one per edge, with
+    # the edges of a trace separated by None gaps
+    edge_traces = []
+    if edges:
+        sources = np.array([node_index[source] for source, _, _ in edges])
+        targets = np.array([node_index[target] for _, target, _ in edges])
+        widths = np.minimum(np.array([weight for _, _, weight in edges]) / 10, 5)
+        buckets = np.digitize(widths, EDGE_WIDTH_BUCKETS)
+        
+        for bucket in np.unique(buckets):
+            in_bucket = buckets == bucket
+            n_edges = int(in_bucket.sum())
+            edge_x = np.full(3 * n_edges, None, dtype=object)
+            edge_y = np.full(3 * n_edges, None, dtype=object)
+            edge_x[0::3] = node_x[sources[in_bucket]]
+            edge_x[1::3] = node_x[targets[in_bucket]]
+            edge_y[0::3] = node_y[sources[in_bucket]]
+            edge_y[1::3] = node_y[targets[in_bucket]]
+            
+            edge_traces.append(go.Scatter(
+                x=edge_x,
+                y=edge_y,
+                mode='lines',
+                line=dict(
+                    width=float(widths[in_bucket].mean()),
+                    color='lightgray'
+                ),
+                hoverinfo='none',
+                showlegend=False
+            ))
+    
+    # Draw nodes
+    node_trace = go.Scatter(
+        x=node_x,
+        y=node_y,
+        mode='markers+text',
+        text=node_text,
+        textposition="top center",
+        marker=dict(
+            size=30,
+            color='lightblue',
+            line=dict(width=2, color='darkblue')
+        ),
+        hovertemplate='<b>%{text}</b><extra></extra>',
+        showlegend=False
+    )
+    
+    # Create figure
+    fig = go.Figure(data=edge_traces + [node_trace])
+    
+    fig.update_layout(
+        title=f"Sequence Flow Network (Top {top_n} Patterns)",
+        showlegend=False,
+        hovermode='closest',
+        height=600,
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+    )
+    
+    return fig
+
+
+@st.fragment
 def render_network_graph(api_url: str) -> None:
     """
     Render network graph showing sequence flows.
     
+    This is a fragment: moving its slider reruns only this graph, which
+    loads the data for the new pattern count itself.
+    
     Args:
         api_url: Base URL of the backend API
     """
@@ -311,85 +556,20 @@ def render_network_graph(api_url: str) -> None:
     top_n = st.slider("Number of patterns to include", 5, 30, 15, 5, key="network_top_n")
     
     try:
-        response = requests.get(f"{api_url}/visualizations/network?top_n={top_n}", timeout=30)
+        data = fetch_network(api_url, st.session_state.get('session_id'),
+                             st.session_state.get('mining_run_id'), top_n)
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Build network using Plotly
-            nodes = data['nodes']
-            edges = data['edges']
-            
-            # Create edge trace
-            edge_traces = []
-            
-            # Simple layout - circular
-            import math
-            n_nodes = len(nodes)
-            node_positions = {}
-            
-            for i, node in enumerate(nodes):
-                angle = 2 * math.pi * i / n_nodes
-                x = math.cos(angle)
-                y = math.sin(angle)
-                node_positions[node['id']] = (x, y)
-            
-            # Draw edges
-            for edge in edges:
-                x0, y0 = node_positions[edge['source']]
-                x1, y1 = node_positions[edge['target']]
-                
-                edge_trace = go.Scatter(
-                    x=[x0, x1, None],
-                    y=[y0, y1, None],
-                    mode='lines',
-                    line=dict(
-                        width=min(edge['weight'] / 10, 5),
-                        color='lightgray'
-                    ),
-                    hoverinfo='none',
-                    showlegend=False
-                )
-                edge_traces.append(edge_trace)
-            
-            # Draw nodes
-            node_x = [node_positions[node['id']][0] for node in nodes]
-            node_y = [node_positions[node['id']][1] for node in nodes]
-            node_text = [node['label'] for node in nodes]
-            
-            node_trace = go.Scatter(
-                x=node_x,
-                y=node_y,
-                mode='markers+text',
-                text=node_text,
-                textposition="top center",
-                marker=dict(
-                    size=30,
-                    color='lightblue',
-                    line=dict(width=2, color='darkblue')
-                ),
-                hovertemplate='<b>%{text}</b><extra></extra>',
-                showlegend=False
-            )
-            
-            # Create figure
-            fig = go.Figure(data=edge_traces + [node_trace])
-            
-            fig.update_layout(
-                title=f"Sequence Flow Network (Top {top_n} Patterns)",
-                showlegend=False,
-                hovermode='closest',
-                height=600,
-                xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            st.info("💡 Nodes represent items, edges represent transitions. Thicker edges indicate more frequent transitions.")
-            
-        else:
-            st.error("Failed to load network data.")
-            
+        fig = _build_network_fig(
+            tuple((node['id'], node['label']) for node in data['nodes']),
+            tuple((edge['source'], edge['target'], edge['weight']) for edge in data['edges']),
+            top_n
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.info("💡 Nodes represent items, edges represent transitions. Thicker edges indicate more frequent transitions.")
+        
+    except requests.exceptions.HTTPError:
+        st.error("Failed to load network data.")
     except Exception as e:
         st.error(f"Error rendering network graph: {str(e)}")
@@ -7,15 +7,23 @@ This component handles:
 - Mining execution trigger
 """
 
+import hashlib
+import json
 import streamlit as st
 import requests
+from components.api_client import batch
 from typing import Optional, Dict, Any
 
 
+@st.fragment
 def render_parameters_section() -> Dict[str, Any]:
     """
     Render the mining parameters configuration section.
     
+    This is a fragment: changing a parameter reruns only this section, not
+    the results below it. The mining button is outside the fragment, so
+    clicking it reruns the page and picks up the current values.
+    
     Returns:
         Dictionary with mining parameters
     """
@@ -83,6 +91,29 @@ def render_parameters_section() -> Dict[str, Any]:
     }
 
 
+def mining_run_id(parameters: Dict[str, Any]) -> str:
+    """
+    Identify a mining run by its dataset, column mapping and parameters.
+    
+    The backend memoizes runs per dataset and parameters, so repeating a run
+    returns the same results; giving it the same ID lets the dashboard and
+    table caches be reused as well. The mapping is the one the backend's
+    sequences were generated from, not the one last submitted in the form.
+    
+    Args:
+        parameters: Mining parameters
+        
+    Returns:
+        Hex digest identifying the run
+    """
+    key = json.dumps([
+        st.session_state.get('session_id'),
+        st.session_state.get('preprocessed_mapping'),
+        parameters
+    ], sort_keys=True)
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
 def execute_mining(api_url: str, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Execute pattern mining with given parameters.
@@ -106,18 +137,18 @@ def execute_mining(api_url: str, parameters: Dict[str, Any]) -> Optional[Dict[st
                 progress_text.text("Initializing PrefixSpan algorithm...")
                 progress_bar.progress(20)
                 
-                # Send mining request
-                response = requests.post(
-                    f"{api_url}/mine",
-                    json=parameters,
-                    timeout=300  # 5 minutes timeout for large datasets
-                )
+                # Send mining request, fetching the first page of the results
+                # table in the same round trip
+                results = batch(api_url, [
+                    {'method': 'POST', 'path': '/mine', 'body': parameters},
+                    {'method': 'GET', 'path': '/results/table', 'params': {'limit': 50}}
+                ], timeout=300)  # 5 minutes timeout for large datasets
                 
                 progress_bar.progress(80)
                 progress_text.text("Processing results...")
                 
-                if response.status_code == 200:
-                    result = response.json()
+                if all(r['status_code'] == 200 for r in results):
+                    result = results[0]['body']
                     
                     progress_bar.progress(100)
                     progress_text.empty()
@@ -128,13 +159,17 @@ def execute_mining(api_url: str, parameters: Dict[str, Any]) -> Optional[Dict[st
                     # Store in session state
                     st.session_state['mining_done'] = True
                     st.session_state['mining_result'] = result
+                    st.session_state['mining_run_id'] = mining_run_id(parameters)
+                    st.session_state['results_table'] = results[1]['body']
                     
                     return result
                 else:
                     progress_text.empty()
                     progress_bar.empty()
                     
-                    error_detail = response.json().get('detail', 'Unknown error')
+                    # Report the operation that failed; the batch stops there
+                    failed = next(r for r in results if r['status_code'] != 200)
+                    error_detail = failed['body'].get('detail', 'Unknown error')
                     st.error(f"❌ Mining failed: {error_detail}")
                     return None
                     
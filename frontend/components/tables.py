@@ -3,116 +3,216 @@ Results table component for Streamlit frontend.
 
 This component handles:
 - Display of mined patterns in table format
-- Filtering and sorting
+- Filtering and pagination (done by the backend)
 - Export functionality
 """
 
+import math
 import streamlit as st
 import requests
+from components.api_client import get_session, decode_json
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
+# Rows per table page offered to the user; the first page fetched with the
+# mining results uses the default
+PAGE_SIZES = [25, 50, 100]
+DEFAULT_PAGE_SIZE = 50
 
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def fetch_table_page(api_url: str, session_id: str, run_id: Optional[str], offset: int,
+                     limit: Optional[int], min_support: int,
+                     lengths: Optional[Tuple[int, ...]]) -> Dict[str, Any]:
+    """
+    Fetch one filtered page of the results table.
+    
+    The backend filters and slices the patterns, so only the page is
+    transferred and held here.
+    
+    Args:
+        api_url: Base URL of the backend API
+        session_id: Session identifier returned by /upload
+        run_id: Identifier of the mining run; a new run gets a new ID
+        offset: Number of matching patterns to skip
+        limit: Maximum number of rows (None for all)
+        min_support: Minimum support count
+        lengths: Pattern lengths to keep (None for all)
+        
+    Returns:
+        Page as returned by /results/table
+        
+    Raises:
+        requests.exceptions.HTTPError: If the backend returns an error
+    """
+    params = {'session_id': session_id, 'offset': offset, 'min_support': min_support}
+    if limit is not None:
+        params['limit'] = limit
+    if lengths is not None:
+        params['lengths'] = list(lengths)
+    
+    response = get_session().get(f"{api_url}/results/table", params=params, timeout=30)
+    response.raise_for_status()
+    return decode_json(response)
+
+
+def export_csv(api_url: str, session_id: str, run_id: Optional[str], min_support: int,
+               lengths: Optional[Tuple[int, ...]]) -> str:
+    """
+    Get all patterns matching the filters as CSV.
+    
+    Args:
+        api_url: Base URL of the backend API
+        session_id: Session identifier returned by /upload
+        run_id: Identifier of the mining run
+        min_support: Minimum support count
+        lengths: Pattern lengths to keep (None for all)
+        
+    Returns:
+        CSV text
+    """
+    page = fetch_table_page(api_url, session_id, run_id, 0, None, min_support, lengths)
+    columns = ['rank', 'pattern', 'sequence', 'length', 'support', 'support_percent']
+    return pd.DataFrame(page['patterns'], columns=columns).to_csv(index=False)
+
+
+@st.fragment
 def render_results_table(api_url: str) -> None:
     """
-    Render the results table with all mined patterns.
+    Render the results table with all mined patterns, one page at a time.
+    
+    This is a fragment: changing a filter or the page reruns only the table.
     
     Args:
         api_url: Base URL of the backend API
     """
     st.markdown("### 📋 All Mined Patterns")
     
+    session_id = st.session_state.get('session_id')
+    run_id = st.session_state.get('mining_run_id')
+    
     try:
-        # Fetch table data from backend
-        response = requests.get(f"{api_url}/results/table", timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            patterns = data['patterns']
-            
-            if not patterns:
-                st.info("No patterns found with the current parameters.")
-                return
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(patterns)
-            
-            # Filters
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                # Length filter
-                lengths = sorted(df['length'].unique())
-                selected_lengths = st.multiselect(
-                    "Filter by Length",
-                    options=lengths,
-                    default=lengths,
-                    help="Select pattern lengths to display"
-                )
-            
-            with col2:
-                # Support filter
-                min_support = st.number_input(
-                    "Minimum Support Count",
-                    min_value=int(df['support'].min()),
-                    max_value=int(df['support'].max()),
-                    value=int(df['support'].min()),
-                    help="Filter patterns by minimum support"
-                )
-            
-            with col3:
-                # Top N filter
-                top_n = st.number_input(
-                    "Show Top N Patterns",
-                    min_value=10,
-                    max_value=len(patterns),
-                    value=min(50, len(patterns)),
-                    step=10,
-                    help="Limit number of patterns displayed"
-                )
-            
-            # Apply filters
-            filtered_df = df[
-                (df['length'].isin(selected_lengths)) &
-                (df['support'] >= min_support)
-            ].head(top_n)
-            
-            # Display count
-            st.markdown(f"Showing **{len(filtered_df)}** of **{len(patterns)}** patterns")
-            
-            # Display table
-            st.dataframe(
-                filtered_df,
-                use_container_width=True,
-                height=400,
-                column_config={
-                    "rank": "Rank",
-                    "pattern": "Pattern",
-                    "length": "Length",
-                    "support": "Support",
-                    "support_percent": "Support %"
-                },
-                hide_index=True
+        # The first page is fetched along with the mining results; ask the
+        # backend only when it is not available. Any page also carries the
+        # lengths and support range used by the filters
+        first_page = st.session_state.get('results_table')
+        if first_page is None:
+            first_page = fetch_table_page(api_url, session_id, run_id, 0, DEFAULT_PAGE_SIZE, 0, None)
+        
+        if not first_page['total']:
+            st.info("No patterns found with the current parameters.")
+            return
+        
+        all_lengths = first_page['lengths']
+        support_min, support_max = first_page['support_range']
+        
+        # Filters
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            # Length filter
+            selected_lengths = st.multiselect(
+                "Filter by Length",
+                options=all_lengths,
+                default=all_lengths,
+                help="Select pattern lengths to display"
+            )
+        
+        with col2:
+            # Support filter
+            min_support = st.number_input(
+                "Minimum Support Count",
+                min_value=support_min,
+                max_value=support_max,
+                value=support_min,
+                help="Filter patterns by minimum support"
+            )
+        
+        with col3:
+            # Page size
+            page_size = st.selectbox(
+                "Patterns per Page",
+                options=PAGE_SIZES,
+                index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                help="Number of patterns shown per page"
             )
-            
-            # Export options
-            st.markdown("---")
-            col1, col2 = st.columns([3, 1])
-            
-            with col2:
-                # Download as CSV
-                csv = filtered_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download CSV",
-                    data=csv,
-                    file_name="mined_patterns.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-            
+        
+        if not selected_lengths:
+            st.info("Select at least one pattern length.")
+            return
+        
+        # None means no length filter, which lets the first page be reused
+        lengths = None if len(selected_lengths) == len(all_lengths) else tuple(sorted(selected_lengths))
+        
+        def load_page(page: int) -> Dict[str, Any]:
+            offset = (page - 1) * page_size
+            if ((offset, page_size, lengths) == (first_page['offset'], first_page['limit'], None)
+                    and min_support <= support_min):
+                return first_page
+            return fetch_table_page(api_url, session_id, run_id, offset, page_size, min_support, lengths)
+        
+        # The page widget is drawn below the table, so its value is read
+        # from session state; filters can shrink the number of pages below it
+        if 'table_page' not in st.session_state:
+            st.session_state['table_page'] = 1
+        page = st.session_state['table_page']
+        data = load_page(page)
+        page_count = max(1, math.ceil(data['total'] / page_size))
+        if page > page_count:
+            page = page_count
+            st.session_state['table_page'] = page
+            data = load_page(page)
+        
+        # Display count
+        offset = (page - 1) * page_size
+        if data['patterns']:
+            st.markdown(f"Showing **{offset + 1}–{offset + len(data['patterns'])}** of "
+                        f"**{data['total']}** matching patterns ({first_page['total']} in total)")
         else:
-            st.error("Failed to fetch results from backend.")
-            
+            st.markdown(f"Showing **0** of **{first_page['total']}** patterns")
+        
+        # Display table
+        st.dataframe(
+            pd.DataFrame(data['patterns']),
+            use_container_width=True,
+            height=400,
+            column_config={
+                "rank": "Rank",
+                "pattern": "Pattern",
+                "length": "Length",
+                "support": "Support",
+                "support_percent": "Support %"
+            },
+            hide_index=True
+        )
+        
+        # Pagination and export options
+        st.markdown("---")
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            st.number_input(
+                f"Page (of {page_count})",
+                min_value=1,
+                max_value=page_count,
+                key="table_page"
+            )
+        
+        with col2:
+            # Download all matching patterns as CSV; they are only fetched
+            # when the button is clicked, and the click does not rerun the
+            # page
+            st.download_button(
+                label="📥 Download CSV",
+                data=lambda: export_csv(api_url, session_id, run_id, min_support, lengths),
+                file_name="mined_patterns.csv",
+                mime="text/csv",
+                on_click="ignore",
+                use_container_width=True
+            )
+        
+    except requests.exceptions.HTTPError:
+        st.error("Failed to fetch results from backend.")
     except Exception as e:
         st.error(f"Error displaying results: {str(e)}")
 
@@ -7,8 +7,10 @@ This component handles:
 - Upload status display
 """
 
+import hashlib
 import streamlit as st
 import requests
+from components.api_client import get_session, upload_file, decode_json
 from typing import Optional, Dict, Any
 
 
@@ -48,20 +50,31 @@ def render_upload_section(api_url: str) -> Optional[Dict[str, Any]]:
         if st.button("🚀 Upload and Validate", type="primary", use_container_width=True):
             with st.spinner("Uploading and validating dataset..."):
                 try:
-                    # Prepare file for upload
-                    files = {'file': (uploaded_file.name, uploaded_file.getvalue(), 'text/csv')}
+                    # The backend keys datasets by content hash; if it still
+                    # has this file, reuse it instead of uploading it again
+                    content_hash = hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+                    response = get_session().get(
+                        f"{api_url}/preview",
+                        params={'session_id': content_hash},
+                        timeout=30
+                    )
                     
-                    # Send to backend
-                    response = requests.post(f"{api_url}/upload", files=files, timeout=30)
+                    if response.status_code == 404:
+                        # Stream the file to the backend
+                        response = upload_file(f"{api_url}/upload", uploaded_file.name, uploaded_file, 'text/csv')
                     
                     if response.status_code == 200:
-                        preview_data = response.json()
+                        preview_data = decode_json(response)
                         
                         st.success("✅ Dataset uploaded and validated successfully!")
                         
                         # Store in session state
                         st.session_state['dataset_uploaded'] = True
                         st.session_state['preview_data'] = preview_data
+                        st.session_state['session_id'] = preview_data['session_id']
+                        st.session_state.pop('column_mapping', None)
+                        st.session_state.pop('preprocessed_mapping', None)
+                        st.session_state.pop('results_table', None)
                         
                         return preview_data
                     else: